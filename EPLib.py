@@ -2,8 +2,121 @@
 # Módulo de suporte para realização das tarefas #
 # ============================================= #
 
+import os
+import time
+import hashlib
+
 import numpy as np
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# ============================================= #
+# Matriz tridiagonal simétrica compacta         #
+# ============================================= #
+
+class TridiagonalMatrix:
+    """
+    Matriz tridiagonal simétrica armazenada somente por suas diagonais, em vetores contíguos
+    (float64): alpha (diagonal principal, n elementos) e beta (diagonais abaixo e acima da
+    principal, n-1 elementos). A memória ocupada é O(n); a forma densa só é gerada por to_dense().
+    """
+
+    __slots__ = ('alpha', 'beta')
+
+    def __init__(self, alpha, beta):
+        self.alpha = np.ascontiguousarray(alpha, dtype=float)
+        self.beta = np.ascontiguousarray(beta, dtype=float)
+
+        assert self.alpha.ndim == 1 and self.beta.ndim == 1
+        assert self.beta.shape[0] == max(self.alpha.shape[0]-1, 0)
+
+    @classmethod
+    def constant(cls, alpha: float, beta: float, n: int) -> "TridiagonalMatrix":
+        """
+        Gera a matriz de dimensão n cujos elementos da diagonal principal são todos iguais a
+        alpha e os das diagonais abaixo e acima dessa são iguais a beta.
+        """
+
+        return cls(np.full(n, alpha, dtype=float), np.full(max(n-1, 0), beta, dtype=float))
+
+    @classmethod
+    def from_springs(cls, k_vals: np.ndarray, m: float) -> "TridiagonalMatrix":
+        """
+        Gera a matriz de um sistema massa-mola com n massas iguais a m, presas entre si e às
+        extremidades por n+1 molas de constantes elásticas k_vals.
+        """
+
+        k_vals = np.asarray(k_vals, dtype=float)
+
+        return cls((k_vals[:-1] + k_vals[1:]) / m, -k_vals[1:-1] / m)
+
+    @property
+    def n(self) -> int:
+        return self.alpha.shape[0]
+
+    @property
+    def shape(self) -> "tuple[int, int]":
+        return (self.n, self.n)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __repr__(self) -> str:
+        return f"TridiagonalMatrix(alpha={self.alpha!r}, beta={self.beta!r})"
+
+    def copy(self) -> "TridiagonalMatrix":
+        return TridiagonalMatrix(np.copy(self.alpha), np.copy(self.beta))
+
+    def matvec(self, X: np.ndarray) -> np.ndarray:
+        """
+        Calcula o produto da matriz por um vetor ou pelas colunas de uma matriz em O(n) por coluna.
+        """
+
+        X = np.asarray(X)
+        alpha = self.alpha if X.ndim == 1 else self.alpha[:, None]
+        beta = self.beta if X.ndim == 1 else self.beta[:, None]
+
+        Y = alpha * X
+        Y[:-1] += beta * X[1:]
+        Y[1:] += beta * X[:-1]
+
+        return Y
+
+    def __matmul__(self, X: np.ndarray) -> np.ndarray:
+        return self.matvec(X)
+
+    def __mul__(self, scalar: float) -> "TridiagonalMatrix":
+        return TridiagonalMatrix(self.alpha * scalar, self.beta * scalar)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar: float) -> "TridiagonalMatrix":
+        return TridiagonalMatrix(self.alpha / scalar, self.beta / scalar)
+
+    def __getitem__(self, key: slice) -> "TridiagonalMatrix":
+        """
+        Retorna a submatriz principal (contígua) indicada pela fatia, por exemplo T[2:5].
+        """
+
+        assert isinstance(key, slice) and key.step in (None, 1)
+        start, stop, _ = key.indices(self.n)
+        stop = max(start, stop)
+
+        return TridiagonalMatrix(self.alpha[start:stop], self.beta[start:max(start, stop-1)])
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Gera explicitamente a matriz densa n x n.
+        """
+
+        M = np.diag(self.beta, k=-1)
+        M += np.diag(self.alpha, k=0)
+        M += np.diag(self.beta, k=1)
+
+        return M
+
 
 # ============================================= #
 # Algoritmo QR                                  #
@@ -95,182 +208,2200 @@ def givens_matrix(n: int, i: int, c: float, s: float) -> np.ndarray:
     return G
 
 
-def givens_rotation(A: np.ndarray) -> "tuple[np.ndarray, np.ndarray]":
+def rotate_columns(M: np.ndarray, i: int, c: float, s: float, work: np.ndarray) -> None:
+    """
+    Aplica, in-place, a rotação de Givens às colunas i e i+1 de uma matriz, isto é,
+    M[:, i:i+2] = M[:, i:i+2] @ G.T, vetorizando a operação ao longo das linhas.
+    Para rotacionar as linhas i e i+1 (M = G @ M), basta fornecer M.T. As colunas de M
+    devem ser contíguas (ordem de Fortran): em ordem de linhas, cada coluna é lida com
+    passo n, várias vezes mais lentamente.
+
+    Args:
+        M (np.ndarray): matriz a ter as colunas rotacionadas (modificada in-place).
+        i (int): índice da coluna a sofrer rotação com i+1.
+        c (float): valor do cosseno da rotação.
+        s (float): valor do seno da rotação.
+        work (np.ndarray): memória auxiliar pré-alocada de formato (2, M.shape[0]).
+    """
+
+    col_i = M[:, i]
+    col_j = M[:, i+1]
+
+    np.multiply(col_j, s, out=work[0])
+    np.multiply(col_i, s, out=work[1])
+
+    col_i *= c
+    col_i -= work[0]
+    col_j *= c
+    col_j += work[1]
+
+    return
+
+
+def apply_rotations(M: np.ndarray, c_vec: np.ndarray, s_vec: np.ndarray, lo: int, hi: int, work: np.ndarray) -> None:
+    """
+    Acumula, in-place, a sequência de rotações de uma iteração QR nas colunas de uma matriz,
+    isto é, M = M @ Q com Q = G(lo).T @ ... @ G(hi-1).T, sem gerar matrizes temporárias.
+
+    Args:
+        M (np.ndarray): matriz a ter as colunas rotacionadas (modificada in-place).
+        c_vec (np.ndarray): cossenos das rotações (posições lo até hi-1).
+        s_vec (np.ndarray): senos das rotações (posições lo até hi-1).
+        lo (int): índice da primeira rotação.
+        hi (int): índice da última rotação mais um.
+        work (np.ndarray): memória auxiliar pré-alocada de formato (2, M.shape[0]).
+    """
+
+    for i in range(lo, hi):
+        rotate_columns(M, i, c_vec[i], s_vec[i], work)
+
+    return
+
+
+def givens_rotation(A: np.ndarray, V: np.ndarray=None, work: np.ndarray=None) -> "tuple[np.ndarray, np.ndarray]":
     """
     Realiza um passo da decomposição QR em matrizes tridiagonais simétricas por meio da rotação de Givens.
+    As rotações são aplicadas diretamente sobre pares de linhas/colunas, sem formar as matrizes de Givens.
 
     Args:
         A (np.ndarray): matriz tridiagonal simétrica a ser decomposta em Q (ortonormal) e R (triangular superior).
+        V (np.ndarray/None): se fornecida, acumula in-place as rotações em suas colunas (V = V @ Q).
+        work (np.ndarray/None): memória auxiliar pré-alocada de formato (2, n); alocada se None.
 
     Returns:
         tuple: uma tupla com as matrizes Q (primeira posição) e R (segunda posição).
     """
 
     n = A.shape[0]
-    Q = np.eye(n) # Inicializa a matriz ortogonal
+    Q = np.eye(n, order='F') # Inicializa a matriz ortogonal (colunas contíguas, ver rotate_columns)
     R = np.copy(A) # Operações não in-place
 
+    if work is None:
+        work = np.empty((2, n))
+
     # Itera ao longo da diagonal principal (crescente)
     for m in range(0, n-1, 1):
-        # Gera a matriz de rotação
+        # Calcula a rotação
         c, s = cos_and_sin(R[m, m], R[m+1, m])
-        G = givens_matrix(n, m, c, s)
 
-        # Calcula Q e R
-        Q = Q @ G.T
-        R = G @ R
+        # Calcula Q e R (Q = Q @ G.T e R = G @ R)
+        rotate_columns(Q, m, c, s, work)
+        rotate_columns(R.T, m, c, s, work)
+
+        if V is not None:
+            rotate_columns(V, m, c, s, work)
 
     return (Q, R)
 
 
-def QR(A0: np.ndarray, epsilon: float=1e-6, shifted: bool=True) -> "tuple[np.ndarray, np.ndarray, int]":
+def tridiagonal_vectors(A0: "np.ndarray | TridiagonalMatrix") -> "tuple[np.ndarray, np.ndarray]":
     """
-    Por meio de decomposições QR com deslocamento espectral, calcula as matrizes Lambda e V tais que
-    V @ Lambda @ V.T == A0, sendo:
-    
-    - A0: tridiagonal simétrica;
-    - V: ortonormal, cujas colunas são autovetores de A0;
-    - Lambda: tridiagonal simétrica, cuja diagonal principal são autovalores de A0. 
+    Extrai cópias (float64) das diagonais de uma matriz tridiagonal simétrica.
 
     Args:
-        A0 (np.ndarray): matriz tridiagonal simétrica a ser decomposta.
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica (densa ou compacta).
+
+    Returns:
+        tuple: diagonal principal alpha (primeira posição) e diagonal abaixo da
+        principal beta (segunda posição).
+    """
+
+    if isinstance(A0, TridiagonalMatrix):
+        return (np.copy(A0.alpha), np.copy(A0.beta))
+
+    alpha = np.diag(A0).astype(float)
+    beta = np.diag(A0, k=-1).astype(float)
+
+    return (alpha, beta)
+
+
+def implicit_qr_sweep(alpha: np.ndarray, beta: np.ndarray, mu: float, lo: int, hi: int,
+                      c_vec: np.ndarray, s_vec: np.ndarray) -> None:
+    """
+    Realiza, in-place e em O(n), uma iteração QR com deslocamento implícito sobre o bloco
+    [lo, hi] de uma matriz tridiagonal simétrica representada apenas por suas diagonais.
+
+    A primeira rotação é calculada sobre alpha[lo] - mu e beta[lo]; as demais perseguem o
+    elemento fora da banda ("bulge") criado pela anterior até a base do bloco. Pelo teorema
+    do Q implícito, o resultado equivale a R @ Q + mu*I da versão explícita.
+
+    Args:
+        alpha (np.ndarray): diagonal principal (modificada in-place).
+        beta (np.ndarray): diagonal abaixo da principal (modificada in-place).
+        mu (float): deslocamento espectral.
+        lo (int): índice do primeiro elemento do bloco.
+        hi (int): índice do último elemento do bloco.
+        c_vec (np.ndarray): recebe, nas posições lo até hi-1, os cossenos das rotações.
+        s_vec (np.ndarray): recebe, nas posições lo até hi-1, os senos das rotações.
+    """
+
+    x = alpha[lo] - mu
+    z = beta[lo]
+
+    for i in range(lo, hi):
+        # Rotação que anula z (beta ou "bulge") contra x
+        if z == 0.0:
+            c, s = 1.0, 0.0
+        else:
+            c, s = cos_and_sin(x, z)
+
+        if i > lo:
+            beta[i-1] = c*x - s*z
+
+        # Aplica G @ B @ G.T ao bloco 2x2 [[a, b], [b, d]]
+        a, b, d = alpha[i], beta[i], alpha[i+1]
+        alpha[i] = c*c*a - 2.0*c*s*b + s*s*d
+        alpha[i+1] = s*s*a + 2.0*c*s*b + c*c*d
+        beta[i] = c*s*(a - d) + (c*c - s*s)*b
+
+        # Gera o novo "bulge" na posição (i+2, i)
+        if i < hi-1:
+            z = -s * beta[i+1]
+            beta[i+1] = c * beta[i+1]
+
+        x = beta[i]
+
+        c_vec[i] = c
+        s_vec[i] = s
+
+    return
+
+
+def negligible(alpha_i, alpha_j, beta_i, epsilon: float, criterion: str='absolute'):
+    """
+    Critério de deflação: determina se o elemento beta_i, entre alpha_i e alpha_j na diagonal,
+    é desprezível. O critério absoluto compara |beta_i| com epsilon; o relativo compara-o com
+    epsilon * sqrt(|alpha_i * alpha_j|), acompanhando a escala local da matriz.
+
+    Args:
+        alpha_i (float/np.ndarray): elemento(s) da diagonal principal acima de beta_i.
+        alpha_j (float/np.ndarray): elemento(s) da diagonal principal abaixo de beta_i.
+        beta_i (float/np.ndarray): elemento(s) da diagonal abaixo da principal.
+        epsilon (float): precisão mínima para determinação da convergência.
+        criterion (str): 'absolute' ou 'relative'.
+
+    Returns:
+        bool/np.ndarray: se beta_i é (são) desprezível(is).
+    """
+
+    if criterion == 'absolute':
+        return np.abs(beta_i) < epsilon
+
+    return np.abs(beta_i) <= epsilon * np.sqrt(np.abs(alpha_i * alpha_j))
+
+
+def split_blocks(beta: np.ndarray, epsilon: float, alpha: np.ndarray=None,
+                 criterion: str='absolute') -> "list[tuple[int, int]]":
+    """
+    Anula (in-place) os elementos desprezíveis de beta e particiona a matriz tridiagonal
+    em blocos independentes não reduzidos (sem elementos nulos abaixo da diagonal).
+
+    Args:
+        beta (np.ndarray): diagonal abaixo da principal (modificada in-place).
+        epsilon (float): precisão mínima para determinação da convergência.
+        alpha (np.ndarray/None): diagonal principal (necessária para o critério relativo).
+        criterion (str): critério de deflação, 'absolute' ou 'relative' (ver negligible).
+
+    Returns:
+        list: lista de tuplas (lo, hi) com os índices do primeiro e do último elemento de cada bloco.
+    """
+
+    if criterion == 'absolute':
+        mask = negligible(None, None, beta, epsilon)
+    else:
+        mask = negligible(alpha[:-1], alpha[1:], beta, epsilon, criterion)
+    beta[mask] = 0.0
+
+    # Um bloco termina em i sempre que beta[i] é desprezível (e na última posição)
+    ends = np.append(np.flatnonzero(mask), beta.shape[0])
+    starts = np.insert(ends[:-1] + 1, 0, 0)
+
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+class RotationLog:
+    """
+    Registro das rotações de Givens do algoritmo QR implícito: somente o ângulo de cada rotação
+    e o intervalo [lo, hi) de colunas de cada iteração. Representa a matriz de autovetores
+    V = G(1).T @ G(2).T @ ... sem formá-la: V @ X e V.T @ X reproduzem as rotações sobre as
+    linhas de X, iteração a iteração, com custo proporcional ao número de colunas de X, e a
+    forma densa só é gerada por to_dense().
+
+    A memória é de um número por rotação, proporcional ao número total de rotações (da ordem
+    de k * n / 2 para k iterações): na tarefa B com n = 300, são 0.8 n^2 números, pouco menos
+    que V densa. A vantagem está em dispensar a acumulação O(n) de cada rotação em V durante
+    as iterações, e compensa quando poucos vetores são necessários (por exemplo, V @ I[:, modos]
+    para os modos mantidos): V @ X reproduz as rotações uma a uma e, para X de n colunas, é
+    centenas de vezes mais lento que o produto com V densa.
+    """
+
+    __slots__ = ('n', 'theta', 'sweeps', 'pending', 'transposed')
+    __array_ufunc__ = None # Faz com que X @ V (X np.ndarray) recorra a __rmatmul__
+
+    def __init__(self, n: int):
+        self.n = n
+        self.theta = np.empty(0)                       # Ângulos, na ordem em que foram aplicados
+        self.sweeps = np.empty((0, 3), dtype=np.int64) # Intervalo [lo, hi) e sentido de cada iteração
+        self.pending = []                              # Iterações ainda não concatenadas
+        self.transposed = False
+
+    @property
+    def shape(self) -> "tuple[int, int]":
+        return (self.n, self.n)
+
+    @property
+    def size(self) -> int:
+        """
+        Número de rotações registradas.
+        """
+
+        self.compact()
+        return self.theta.shape[0]
+
+    @property
+    def T(self) -> "RotationLog":
+        self.compact()
+
+        log = RotationLog(self.n)
+        log.theta, log.sweeps = self.theta, self.sweeps
+        log.transposed = not self.transposed
+
+        return log
+
+    def record(self, c_vec: np.ndarray, s_vec: np.ndarray, lo: int, hi: int, reverse: bool=False) -> None:
+        """
+        Registra as rotações de uma iteração (posições lo até hi-1 de c_vec e s_vec). Se reverse,
+        a iteração foi feita de baixo para cima (QL): a rotação da posição i atuou sobre as
+        colunas (i+1, i), nessa ordem, da posição hi-1 até lo.
+        """
+
+        if reverse:
+            # Rotação (c, s) sobre (i+1, i) equivale a (c, -s) sobre (i, i+1)
+            self.pending.append((np.arctan2(-s_vec[lo:hi][::-1], c_vec[lo:hi][::-1]), lo, hi, 1))
+        else:
+            self.pending.append((np.arctan2(s_vec[lo:hi], c_vec[lo:hi]), lo, hi, 0))
+
+    def compact(self) -> None:
+        """
+        Concatena as iterações registradas aos vetores contíguos.
+        """
+
+        if not self.pending:
+            return
+
+        theta_list, lo_list, hi_list, reverse_list = zip(*self.pending)
+        self.theta = np.concatenate((self.theta,) + theta_list)
+        self.sweeps = np.concatenate((self.sweeps, np.column_stack((lo_list, hi_list, reverse_list))))
+        self.pending = []
+
+    def matmul(self, X: np.ndarray) -> np.ndarray:
+        """
+        Calcula V @ X (ou V.T @ X, se transposto) reproduzindo as rotações sobre as linhas de X,
+        que pode ser um vetor, uma matriz ou um arranjo cujo penúltimo eixo tem n elementos.
+        A memória auxiliar é a de uma iteração por vez.
+        """
+
+        self.compact()
+
+        X = np.asarray(X, dtype=float)
+        assert X.shape[0 if X.ndim == 1 else -2] == self.n
+
+        # Organiza X como (n, colunas), com as linhas contíguas
+        shape = X.shape
+        Y = np.ascontiguousarray(np.moveaxis(X, -2, 0).reshape((self.n, -1)) if X.ndim > 1 else X[:, None])
+        if Y.base is not None or Y is X:
+            Y = np.copy(Y)
+
+        # Posição da primeira rotação de cada iteração em theta
+        offsets = np.concatenate(([0], np.cumsum(self.sweeps[:, 1] - self.sweeps[:, 0]))).tolist()
+
+        # V.T @ X = G(N) @ ... @ G(1) @ X: rotações na ordem de registro
+        # V @ X = G(1).T @ ... @ G(N).T @ X: rotações transpostas (seno negado), na ordem inversa
+        sweeps = range(len(offsets) - 1)
+        sweeps = sweeps if self.transposed else reversed(sweeps)
+        sign = 1.0 if self.transposed else -1.0
+
+        # Poucas colunas: o custo fixo de cada operação do NumPy domina, sendo mais rápido
+        # rotacionar os escalares de cada coluna diretamente
+        scalar = Y.shape[1] <= 16
+        if scalar:
+            columns = [Y[:, j].tolist() for j in range(Y.shape[1])]
+        else:
+            M = Y.T # Rotacionar as colunas de M equivale a rotacionar as linhas de Y
+            work = np.empty((2, M.shape[0]))
+
+        for w in sweeps:
+            lo, hi, reverse = self.sweeps[w].tolist()
+            theta = self.theta[offsets[w]:offsets[w+1]]
+
+            index = range(hi-1, lo-1, -1) if reverse else range(lo, hi)
+            rotations = zip(index, np.cos(theta).tolist(), (sign * np.sin(theta)).tolist())
+            rotations = rotations if self.transposed else reversed(list(rotations))
+
+            if scalar:
+                rotations = list(rotations)
+                for y in columns:
+                    for i, c, s in rotations:
+                        a, b = y[i], y[i+1]
+                        y[i] = c*a - s*b
+                        y[i+1] = s*a + c*b
+            else:
+                for i, c, s in rotations:
+                    rotate_columns(M, i, c, s, work)
+
+        if scalar:
+            for j, y in enumerate(columns):
+                Y[:, j] = y
+
+        if X.ndim == 1:
+            return Y[:, 0]
+
+        return np.moveaxis(Y.reshape((self.n,) + shape[:-2] + shape[-1:]), 0, -2)
+
+    def __matmul__(self, X: np.ndarray) -> np.ndarray:
+        return self.matmul(X)
+
+    def __rmatmul__(self, X: np.ndarray) -> np.ndarray:
+        # X @ V = (V.T @ X.T).T
+        return (self.T @ np.asarray(X).T).T
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Gera explicitamente a matriz densa n x n.
+        """
+
+        return self.matmul(np.eye(self.n))
+
+
+class DiskEigenvectors:
+    """
+    Matriz de autovetores V mantida em disco (np.memmap de um arquivo .npy), para cadeias cuja
+    matriz densa não cabe na memória. As rotações do algoritmo QR implícito são registradas num
+    RotationLog e, ao atingir buffer rotações, acumuladas em fatores densos e aplicadas de uma
+    só vez a V, bloco a bloco de linhas: cada linha evolui independentemente sob rotações de
+    colunas, e um bloco de linhas é uma região contígua do arquivo (durante as iterações, V está
+    em ordem de linhas). Ao final, finalize regrava V em ordem de colunas, e os autovetores são
+    lidos de volta por intervalo de colunas (ver columns).
+    """
+
+    __slots__ = ('path', 'V', 'log', 'pending', 'buffer', 'rows', 'block_bytes')
+
+    def __init__(self, path: str, n: int, buffer: int=2**20, block_bytes: int=2**26, identity: bool=True):
+        self.path = path
+        self.block_bytes = block_bytes
+
+        if identity:
+            self.V = np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=(n, n))
+            self.V[np.arange(n), np.arange(n)] = 1.0 # O arquivo é criado zerado
+        else:
+            self.V = np.load(path, mmap_mode='r+')
+            assert self.V.ndim == 2 and self.V.shape[0] == self.V.shape[1]
+
+        self.log = RotationLog(self.V.shape[0])
+        self.pending = 0                                             # Rotações ainda não aplicadas
+        self.buffer = buffer                                         # Máximo de rotações em memória
+        self.rows = max(1, block_bytes // (8 * max(self.V.shape[1], 1))) # Linhas por bloco
+
+    @classmethod
+    def open(cls, path: str, **kwargs) -> "DiskEigenvectors":
+        """
+        Abre, sem sobrescrever, uma matriz V previamente salva em path.
+        """
+
+        return cls(path, 0, identity=False, **kwargs)
+
+    @property
+    def shape(self) -> "tuple[int, int]":
+        return self.V.shape
+
+    def record(self, c_vec: np.ndarray, s_vec: np.ndarray, lo: int, hi: int, reverse: bool=False) -> None:
+        """
+        Registra as rotações de uma iteração (ver RotationLog.record), aplicando-as a V sempre
+        que o número de rotações registradas atinge buffer.
+        """
+
+        self.log.record(c_vec, s_vec, lo, hi, reverse)
+        self.pending += hi - lo
+
+        if self.pending >= self.buffer:
+            self.flush()
+
+    def factors(self) -> "Iterator[tuple[int, np.ndarray]]":
+        """
+        Agrupa as rotações registradas em fatores ortogonais densos, cada um sobre uma janela de
+        no máximo width colunas consecutivas (width^2 elementos cabem em block_bytes), de modo
+        que V = V @ G(1).T @ G(2).T @ ... equivale a V[:, lo:lo+w] = V[:, lo:lo+w] @ F para
+        cada fator (lo, F), na ordem retornada. Cada iteração é dividida em segmentos de até
+        width-1 rotações consecutivas; um segmento é acumulado no último grupo cujas colunas
+        compartilha (ou, sem conflito, no último grupo), se a janela resultante couber em width,
+        e, caso contrário, inicia um novo grupo. Como cada segmento só sucede grupos com os
+        quais não compartilha colunas, a ordem relativa das rotações que não comutam é mantida.
+
+        Os fatores são formados um a um, à medida que são consumidos.
+
+        Yields:
+            tuple: pares (lo, F), com F de formato (w, w) em ordem de colunas.
+        """
+
+        self.log.compact()
+
+        n = self.V.shape[0]
+        width = max(2, min(n, int(np.sqrt(self.block_bytes / 8))))
+
+        offsets = np.concatenate(([0], np.cumsum(self.log.sweeps[:, 1] - self.log.sweeps[:, 0]))).tolist()
+        groups = [] # [primeira coluna, última coluna, segmentos (iteração, início, fim)]
+
+        for w, (lo, hi, reverse) in enumerate(self.log.sweeps.tolist()):
+            for start in range(0, hi - lo, width - 1):
+                stop = min(start + width - 1, hi - lo)
+
+                # Colunas tocadas pelas rotações start até stop-1 da iteração, na ordem registrada
+                first, last = (hi - stop, hi - start) if reverse else (lo + start, lo + stop)
+
+                conflicts = [g for g, (g_first, g_last, _) in enumerate(groups) if g_first <= last and first <= g_last]
+                g = conflicts[-1] if conflicts else len(groups) - 1
+
+                if g >= 0 and max(last, groups[g][1]) - min(first, groups[g][0]) < width:
+                    groups[g][0] = min(first, groups[g][0])
+                    groups[g][1] = max(last, groups[g][1])
+                    groups[g][2].append((w, start, stop))
+                else:
+                    groups.append([first, last, [(w, start, stop)]])
+
+        for first, last, segments in groups:
+            F = np.eye(last - first + 1, order='F')
+            work = np.empty((2, F.shape[0]))
+
+            for w, start, stop in segments:
+                lo, hi, reverse = self.log.sweeps[w].tolist()
+                theta = self.log.theta[offsets[w]+start:offsets[w]+stop]
+
+                index = range(hi-1-start, hi-1-stop, -1) if reverse else range(lo+start, lo+stop)
+                for i, c, s in zip(index, np.cos(theta).tolist(), np.sin(theta).tolist()):
+                    rotate_columns(F, i - first, c, s, work)
+
+            yield (first, F)
+
+    def flush(self) -> None:
+        """
+        Aplica a V (V = V @ G(1).T @ G(2).T @ ...) as rotações registradas e grava o arquivo.
+        As rotações são acumuladas em fatores densos (ver factors), e cada bloco de linhas de V
+        recebe um produto de matrizes por fator: o custo de reproduzir cada rotação é pago uma
+        vez, e não uma vez por bloco. Os fatores são formados em lotes de até block_bytes bytes,
+        e V é lido e gravado uma vez por lote, de modo que a memória é limitada a cerca de
+        2 block_bytes.
+        """
+
+        def apply(batch):
+            for start in range(0, self.V.shape[0], self.rows):
+                block = np.array(self.V[start:start+self.rows])
+                for first, F in batch:
+                    window = slice(first, first + F.shape[0])
+                    block[:, window] = block[:, window] @ F
+                self.V[start:start+self.rows] = block
+
+        if self.pending > 0:
+            # Lotes de fatores de até block_bytes bytes (ao menos um fator por lote)
+            batch, nbytes = [], 0
+            for first, F in self.factors():
+                if batch and nbytes + F.nbytes > self.block_bytes:
+                    apply(batch)
+                    batch, nbytes = [], 0
+                batch.append((first, F))
+                nbytes += F.nbytes
+            apply(batch)
+
+            self.log = RotationLog(self.V.shape[0])
+            self.pending = 0
+
+        self.V.flush()
+
+    def finalize(self) -> None:
+        """
+        Aplica as rotações pendentes e regrava V em ordem de colunas (Fortran), de modo que cada
+        autovetor ocupe uma região contígua do arquivo. A cópia é feita em blocos quadrados de
+        cerca de block_bytes bytes, lidos e escritos em trechos contíguos de mesmo tamanho, e
+        custa uma única leitura e escrita de V (8 n^2 bytes). Novas rotações continuam válidas,
+        porém mais lentas, pois os blocos de linhas deixam de ser contíguos.
+        """
+
+        self.flush()
+
+        n = self.V.shape[0]
+        if np.isfortran(self.V) or n < 2:
+            return
+
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        F = np.lib.format.open_memmap(temp, mode='w+', dtype=float, shape=(n, n), fortran_order=True)
+
+        side = max(1, int(np.sqrt(self.block_bytes / 8)))
+        for row in range(0, n, side):
+            for col in range(0, n, side):
+                F[row:row+side, col:col+side] = self.V[row:row+side, col:col+side]
+
+        F.flush()
+        del F
+        self.V = None # Libera o mapeamento antes de substituir o arquivo
+
+        os.replace(temp, self.path)
+        self.V = np.load(self.path, mmap_mode='r+')
+
+    def columns(self, start: int, stop: int) -> np.ndarray:
+        """
+        Lê para a memória os autovetores (colunas) de start até stop-1. Após finalize, são lidos
+        somente os 8 n (stop - start) bytes contíguos pedidos; antes, em ordem de linhas, cada
+        leitura toca uma página de cada linha do arquivo, isto é, o arquivo todo.
+        """
+
+        self.flush()
+
+        return np.array(self.V[:, start:stop])
+
+
+def QR_implicit(alpha: np.ndarray, beta: np.ndarray, epsilon: float, shifted: bool, V: np.ndarray,
+                observer: "QRObserver"=None, criterion: str='absolute', direction: str='down') -> int:
+    """
+    Algoritmo QR com deslocamentos implícitos operando apenas sobre as diagonais da matriz.
+    Cada iteração custa O(n) na atualização da matriz, ao invés de O(n^4) na versão explícita.
+
+    Sempre que um elemento de beta se torna desprezível, a matriz é particionada e as iterações
+    atuam somente sobre o bloco não reduzido que contém a base da parte ainda não convergida.
+
+    No sentido 'down' (QR), o "bulge" é perseguido do topo à base do bloco e os autovalores
+    convergem na base; no sentido 'up' (QL), o contrário. Com 'auto', cada novo bloco converge
+    pela extremidade de menor |alpha|, como para matrizes graduadas (por exemplo, tarefa B).
+
+    Args:
+        alpha (np.ndarray): diagonal principal; ao final, contém os autovalores (modificada in-place).
+        beta (np.ndarray): diagonal abaixo da principal; ao final, é nula (modificada in-place).
         epsilon (float): precisão mínima para determinação da convergência.
         shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        V (np.ndarray/RotationLog/DiskEigenvectors): matriz que acumula as rotações em suas
+                                    colunas (modificada in-place), registro em que as rotações são
+                                    apenas anotadas ou matriz em disco que as aplica em lotes.
+        observer (QRObserver/None): recebe os eventos de cada iteração e deflação.
+        criterion (str): critério de deflação, 'absolute' ou 'relative' (ver negligible).
+        direction (str): 'down' (QR), 'up' (QL) ou 'auto'.
 
     Returns:
-        tuple: tupla com a matriz V (primeira posição), a matriz Lambda (segunda posição) e o número
-        total de iterações até a convergência (terceira posição).
+        int: número total de iterações até a convergência.
     """
 
-    n = A0.shape[0]
+    n = alpha.shape[0]
     k = 0 # Número de iterações até a convergência de todos os elementos
 
-    A = np.copy(A0) # Operações não in-place
-    V = np.eye(n)   # Inicializa matriz de autovetores
-    I = np.eye(n)
+    if observer is not None:
+        observer.start(n)
+
+    # Armazenam as rotações de cada iteração
+    c_vec = np.empty(max(n-1, 0), dtype=alpha.dtype)
+    s_vec = np.empty(max(n-1, 0), dtype=alpha.dtype)
+    work = None if isinstance(V, (RotationLog, DiskEigenvectors)) else np.empty((2, V.shape[0]), dtype=V.dtype)
+
+    m = n - 1 # Base da parte ainda não convergida
+    block = (-1, -1, direction == 'up') # Bloco atual (topo, base) e se é percorrido para cima
+
+    # Autovalores já reportados ao observador: no sentido 'up', convergem acima de m
+    reported = np.zeros(n, dtype=bool)
+
+    def deflate(i):
+        if observer is not None and not reported[i]:
+            observer.deflation(i, alpha[i], k)
+        reported[i] = True
 
     # Itera ao longo da diagonal principal (decrescente)
-    for m in range(n-1, 0, -1):
-        # Loop até a convergência de beta
-        while np.abs(A[m, m-1]) >= epsilon: 
-            mu = wilkinson_shift(A[m-1, m-1], A[m, m-1], A[m, m]) if (shifted and k > 0) else 0.0
-            Q, R = givens_rotation(A - mu*I)
-            
-            # Atualiza as matrizes
-            A = R @ Q + mu*I
-            V = V @ Q
+    while m > 0:
+        # Beta convergiu (é nulo)
+        if negligible(alpha[m-1], alpha[m], beta[m-1], epsilon, criterion):
+            beta[m-1] = 0
+            deflate(m)
+            m -= 1
+            continue
 
-            k += 1 # Nova iteração
+        # Topo do bloco não reduzido que termina em m
+        lo = m - 1
+        while lo > 0 and not negligible(alpha[lo-1], alpha[lo], beta[lo-1], epsilon, criterion):
+            lo -= 1
 
-        A[m, m-1] = 0 # Quebra do laço while: beta convergiu (é nulo)
-    
-    Lambda = A
-    
-    return (V, Lambda, k)
+        if lo > 0 and beta[lo-1] != 0:
+            beta[lo-1] = 0
 
+            # O elemento acima ficou isolado: convergiu pelo topo (sentido 'up')
+            if lo == 1 or beta[lo-2] == 0:
+                deflate(lo-1)
 
-# ============================================= #
-# Tarefas                                       #
-# ============================================= #
+        # Mantém o sentido enquanto o bloco só perde elementos pela extremidade que converge
+        top, bottom, up = block
+        if not ((up and bottom == m and lo >= top) or (not up and top == lo and m <= bottom)):
+            up = (direction == 'up') or (direction == 'auto' and np.abs(alpha[lo]) < np.abs(alpha[m]))
+        block = (lo, m, up)
 
-def normalize(matrix: np.ndarray) -> np.ndarray:
+        if up:
+            mu = wilkinson_shift(alpha[lo+1], beta[lo], alpha[lo]) if (shifted and k > 0) else 0.0
+            if observer is not None:
+                observer.iteration(k, lo, mu, np.abs(beta[lo]))
+
+            # QL: iteração QR sobre o bloco invertido (vistas com passo negativo)
+            implicit_qr_sweep(alpha[lo:m+1][::-1], beta[lo:m][::-1], mu, 0, m-lo,
+                              c_vec[lo:m][::-1], s_vec[lo:m][::-1])
+
+            if isinstance(V, (RotationLog, DiskEigenvectors)):
+                V.record(c_vec, s_vec, lo, m, reverse=True)
+            else:
+                apply_rotations(V[:, lo:m+1][:, ::-1], c_vec[lo:m][::-1], s_vec[lo:m][::-1], 0, m-lo, work)
+
+        else:
+            mu = wilkinson_shift(alpha[m-1], beta[m-1], alpha[m]) if (shifted and k > 0) else 0.0
+            if observer is not None:
+                observer.iteration(k, m, mu, np.abs(beta[m-1]))
+
+            implicit_qr_sweep(alpha, beta, mu, lo, m, c_vec, s_vec)
+
+            # Acumula as rotações nas colunas de V (V = V @ Q) ou somente as registra
+            if isinstance(V, (RotationLog, DiskEigenvectors)):
+                V.record(c_vec, s_vec, lo, m)
+            else:
+                apply_rotations(V, c_vec, s_vec, lo, m, work)
+
+        k += 1 # Nova iteração
+
+    if n > 0:
+        deflate(0)
+
+    return k
+
+
+def QR_block(alpha: np.ndarray, beta: np.ndarray, epsilon: float, shifted: bool,
+             criterion: str='absolute', direction: str='down') -> "tuple[np.ndarray, np.ndarray, int]":
     """
-    Normaliza as colunas de uma matriz in-place por meio da  
-    norma Euclidiana para um vetor do R^n.
+    Resolve um bloco tridiagonal independente por meio do algoritmo QR implícito.
+    Utilizada como tarefa nos processos paralelos de QR.
 
     Args:
-        matrix (np.ndarray): matriz a ter suas colunas normalizadas.
+        alpha (np.ndarray): diagonal principal do bloco.
+        beta (np.ndarray): diagonal abaixo da principal do bloco.
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        criterion (str): critério de deflação, 'absolute' ou 'relative' (ver negligible).
+        direction (str): 'down' (QR), 'up' (QL) ou 'auto' (ver QR_implicit).
 
     Returns:
-        np.ndarray: matriz com as colunas normalizadas.
+        tuple: autovetores do bloco (primeira posição), autovalores do bloco (segunda posição)
+        e número de iterações (terceira posição).
     """
 
-    norm = np.sqrt(np.sum(matrix**2, axis=0))
-    matrix = matrix / norm
+    alpha = np.copy(alpha)
+    beta = np.copy(beta)
+    V = np.eye(alpha.shape[0], order='F')
 
-    return matrix
+    k = QR_implicit(alpha, beta, epsilon, shifted, V, None, criterion, direction)
 
+    return (V, alpha, k)
 
-def gen_eign(n: int) -> "tuple[list, np.ndarray]":
+
+def QR_parallel(alpha: np.ndarray, beta: np.ndarray, epsilon: float, shifted: bool,
+                workers: int=None, criterion: str='absolute', direction: str='down') -> "tuple[np.ndarray, np.ndarray, int]":
     """
-    Gera autovalores e autovetores (analitacamente conhecidos) para uma 
-    matriz tridiagonal simétrica cujos elementos da diagonal principal são 
-    todos iguais a 2 e das diagonais abaixo e acima dessa são iguais a -1.
+    Particiona a matriz tridiagonal em todos os elementos desprezíveis de beta e resolve os
+    blocos independentes concorrentemente em um conjunto de processos, reunindo os autopares
+    nas posições correspondentes de V e Lambda.
 
     Args:
-        n (int): dimensão da matriz tridiagonal simétrica.
+        alpha (np.ndarray): diagonal principal.
+        beta (np.ndarray): diagonal abaixo da principal (modificada in-place).
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        workers (int/None): número de processos; se None, utiliza o número de núcleos disponíveis.
+        criterion (str): critério de deflação, 'absolute' ou 'relative' (ver negligible).
+        direction (str): 'down' (QR), 'up' (QL) ou 'auto' (ver QR_implicit).
 
     Returns:
-        tuple: lista de autovalores da matriz (primeira posição) e uma matriz
-        cujas colunas são os respectivos autovetores associados (segunda posição).
+        tuple: matriz de autovetores V (primeira posição), vetor de autovalores (segunda posição)
+        e soma das iterações de todos os blocos (terceira posição).
     """
 
-    # Vetor base (constante) para calcular autovetores 
-    base_vec = np.arange(1, n+1, 1) * np.pi/(n+1)
-    base_vec = np.reshape(base_vec, (n, 1))
-    
-    eigs_vals = [] # Armazena autovalores
-    eign_vecs = [] # Armazena autovetores
+    n = alpha.shape[0]
+    blocks = split_blocks(beta, epsilon, alpha, criterion)
 
-    # Gera autovalores e autovetores
-    for j in range(1, n+1):
-        val = 2 * (1 - np.cos( j*np.pi / (n+1) ))
-        vec = np.sin(base_vec * j)
+    V = np.zeros((n, n), order='F')
+    eigvals = np.copy(alpha)
+    k = 0
 
-        eigs_vals.append(val)
-        eign_vecs.append(vec)
+    # Blocos unitários já são autopares
+    pending = [(lo, hi) for (lo, hi) in blocks if hi > lo]
+    for lo, hi in blocks:
+        if hi == lo:
+            V[lo, lo] = 1.0
 
-    # Concatena uma lista de vetores coluna em uma matriz, normalizando-a
-    eign_vecs = normalize(np.hstack(eign_vecs))
+    if len(pending) == 1 or workers == 1:
+        results = [QR_block(alpha[lo:hi+1], beta[lo:hi], epsilon, shifted, criterion, direction) for (lo, hi) in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(QR_block, alpha[lo:hi+1], beta[lo:hi], epsilon, shifted, criterion, direction)
+                       for (lo, hi) in pending]
+            results = [future.result() for future in futures]
 
-    return (eign_vecs, eigs_vals)
+    # Reúne os autopares dos blocos
+    for (lo, hi), (V_block, eigvals_block, k_block) in zip(pending, results):
+        V[lo:hi+1, lo:hi+1] = V_block
+        eigvals[lo:hi+1] = eigvals_block
+        k += k_block
 
+    return (V, eigvals, k)
 
-def gen_tridiagonal(alpha, beta, n=None) -> np.ndarray:
+
+def cos_and_sin_array(alpha: np.ndarray, beta: np.ndarray) -> "tuple[np.ndarray, np.ndarray]":
     """
-    Gera uma matriz diagonal simétrica.
-    
-    Se alpha e beta forem listas, as insere como diagonal principal (alpha)
-    e diagonais acima e abaixo dessa (beta) numa matriz de zeros.
+    Versão vetorizada de cos_and_sin, aplicada elemento a elemento. Onde beta é nulo,
+    retorna a rotação identidade (c = 1.0 e s = 0.0).
+
+    Args:
+        alpha (np.ndarray): elementos a serem preservados pela rotação.
+        beta (np.ndarray): elementos a serem anulados pela rotação.
+
+    Returns:
+        tuple: vetores de cossenos (primeira posição) e de senos (segunda posição).
+    """
+
+    # Ambos os ramos são avaliados; divisões inválidas são descartadas por np.where
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        tau_a = - beta / alpha
+        c_a = 1.0 / np.sqrt(1.0 + tau_a**2)
+
+        tau_b = - alpha / beta
+        s_b = 1.0 / np.sqrt(1.0 + tau_b**2)
+
+        greater = np.abs(alpha) > np.abs(beta)
+        c = np.where(greater, c_a, s_b * tau_b)
+        s = np.where(greater, c_a * tau_a, s_b)
+
+    # Rotação identidade onde não há o que anular
+    null = beta == 0.0
+    c[null] = 1.0
+    s[null] = 0.0
+
+    return (c, s)
+
 
-    Se alpha e beta forem números, cria uma matriz de zeros com dimensão n 
-    em que os elementos da diagonal princpal são iguais a alpha e os da
-    diagonais axima e abaixo dessa são iguais a beta. 
+def QR_batch(alpha: np.ndarray, beta: np.ndarray, epsilon: float=1e-6,
+             shifted: bool=True) -> "tuple[np.ndarray, np.ndarray, np.ndarray]":
+    """
+    Algoritmo QR com deslocamentos implícitos aplicado simultaneamente a um lote de matrizes
+    tridiagonais simétricas de mesma dimensão, vetorizando as operações ao longo do lote.
+    Cada matriz tem seu próprio critério de convergência e, como em QR_implicit, cada varredura
+    atua somente sobre o bloco não reduzido que contém a base da sua parte ainda não convergida
+    (elementos de beta desprezíveis no interior particionam a matriz); fora desse bloco, e nas
+    matrizes já convergidas, as rotações são a identidade.
 
     Args:
-        alpha (int/float/list): elemento(s) da diagonal principal.
-        beta (int/float/list): elemento(s) das diagonais abaixo e acima da principal.
-        n (int/None): se int, n é a dimensão da matriz; se None, a dimensão deve
-                          estar implícita em alpha e beta.
+        alpha (np.ndarray): diagonais principais empilhadas, de formato (lote, n).
+        beta (np.ndarray): diagonais abaixo das principais empilhadas, de formato (lote, n-1).
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
 
     Returns:
-        np.ndarray: matriz diagonal simétrica.
+        tuple: autovetores empilhados de formato (lote, n, n) (primeira posição), autovalores
+        empilhados de formato (lote, n) (segunda posição) e vetor com o número de iterações
+        de cada matriz (terceira posição).
     """
 
-    assert type(alpha) == type(beta)
+    alpha = np.array(alpha, dtype=float) # Operações não in-place
+    beta = np.array(beta, dtype=float)
+
+    batch, n = alpha.shape
+    rows = np.arange(batch)
+    cols = np.arange(max(n-1, 0))
+
+    V = np.tile(np.eye(n), (batch, 1, 1)) # Inicializa matrizes de autovetores
+    k = np.zeros(batch, dtype=int)       # Iterações de cada matriz
+    m = np.full(batch, n-1)              # Base da parte não convergida de cada matriz
+
+    # Matrizes 1 x 1 já estão diagonalizadas
+    if n < 2:
+        return (V, alpha, k)
+
+    work = np.empty((2, batch, n)) # Memória auxiliar para as rotações
+
+    while True:
+        # Deflação: beta convergiu (é nulo) nas matrizes marcadas
+        while True:
+            converged = (m > 0) & (np.abs(beta[rows, m-1]) < epsilon)
+            if not converged.any():
+                break
+            beta[rows[converged], m[converged]-1] = 0.0
+            m[converged] -= 1
+
+        active = m > 0
+        if not active.any():
+            break
+
+        # Topo do bloco não reduzido que termina em m, em cada matriz: logo abaixo do último
+        # elemento desprezível de beta acima da base
+        negligible_beta = (np.abs(beta) < epsilon) & (cols[None, :] < (m-1)[:, None])
+        beta[negligible_beta] = 0.0
+        lo = np.max(np.where(negligible_beta, cols[None, :] + 1, 0), axis=1)
+
+        # Deslocamentos de Wilkinson de cada matriz
+        a, b, a_last = alpha[rows, m-1], beta[rows, m-1], alpha[rows, m]
+        d = (a - a_last) / 2.0
+        mu = a_last + d - np.where(d >= 0.0, 1.0, -1.0) * np.sqrt(d**2 + b**2)
+        mu[~(active & shifted & (k > 0))] = 0.0
+
+        # Varredura implícita, com rotações identidade fora dos blocos ativos
+        x = np.zeros(batch)
+        z = np.zeros(batch)
+
+        for i in range(lo[active].min(), m.max()):
+            # Início da perseguição do "bulge" nas matrizes cujo bloco começa em i
+            start = lo == i
+            x[start] = alpha[start, i] - mu[start]
+            z[start] = beta[start, i]
+
+            c, s = cos_and_sin_array(x, z)
+            inactive = (i < lo) | (i >= m)
+            c[inactive] = 1.0
+            s[inactive] = 0.0
+
+            # Elemento anterior de beta, somente onde a rotação i-1 atuou
+            if i > 0:
+                beta[:, i-1] = np.where((lo < i) & (i <= m), c*x - s*z, beta[:, i-1])
+
+            a, b, d = alpha[:, i].copy(), beta[:, i].copy(), alpha[:, i+1].copy()
+            alpha[:, i] = c*c*a - 2.0*c*s*b + s*s*d
+            alpha[:, i+1] = s*s*a + 2.0*c*s*b + c*c*d
+            beta[:, i] = c*s*(a - d) + (c*c - s*s)*b
+
+            if i < n-2:
+                z = -s * beta[:, i+1]
+                beta[:, i+1] *= c
+
+            x = beta[:, i].copy()
+
+            # Acumula a rotação nas colunas i e i+1 de cada V
+            c, s = c[:, None], s[:, None]
+            col_i, col_j = V[:, :, i], V[:, :, i+1]
+            np.multiply(col_j, s, out=work[0])
+            np.multiply(col_i, s, out=work[1])
+            col_i *= c
+            col_i -= work[0]
+            col_j *= c
+            col_j += work[1]
+
+        k[active] += 1 # Nova iteração
+
+    return (V, alpha, k)
+
+
+def pwk_sweep(alpha: np.ndarray, beta2: np.ndarray, mu: float, lo: int, hi: int) -> None:
+    """
+    Realiza, in-place, uma iteração QR implícita livre de raízes quadradas (Pal-Walker-Kahan)
+    sobre o bloco [lo, hi], operando sobre a diagonal principal e os quadrados dos elementos
+    da diagonal abaixo da principal. Os autovetores não são calculados.
 
-    if isinstance(alpha, (float, int)):
-        assert n is not None
-        
-        # Cria vetores baseado nos valores passados
-        alpha_vec = n * [alpha]
-        beta_vec = (n-1) * [beta]
-        
-        # Insere vetores em uma matriz de zeros
-        M = np.diag(beta_vec, k=-1)
-        M += np.diag(alpha_vec, k=0)        
-        M += np.diag(beta_vec, k=1)
-
-    elif isinstance(alpha, list):
-        assert len(alpha) == len(beta)+1
-        assert n is None
+    Args:
+        alpha (np.ndarray): diagonal principal (modificada in-place).
+        beta2 (np.ndarray): quadrados da diagonal abaixo da principal (modificada in-place).
+        mu (float): deslocamento espectral.
+        lo (int): índice do primeiro elemento do bloco.
+        hi (int): índice do último elemento do bloco.
+    """
 
-        # Insere vetores em uma matriz de zeros
-        M = np.diag(beta, k=-1)
-        M += np.diag(alpha, k=0)
-        M += np.diag(beta, k=1)
+    c = 1.0
+    s = 0.0
+    gamma = alpha[lo] - mu
+    p = gamma**2
 
-    return M
+    for i in range(lo, hi):
+        bb = beta2[i]
+        r = p + bb
+
+        if i > lo:
+            beta2[i-1] = s * r
+
+        c_old = c
+        c = p / r
+        s = bb / r
+
+        gamma_old = gamma
+        a = alpha[i+1]
+        gamma = c * (a - mu) - s * gamma_old
+        alpha[i] = gamma_old + (a - gamma)
+
+        p = gamma**2 / c if c != 0.0 else c_old * bb
+
+    beta2[hi-1] = s * p
+    alpha[hi] = mu + gamma
+
+    return
+
+
+def QR_eigenvalues(A0: "np.ndarray | TridiagonalMatrix", epsilon: float=1e-6, shifted: bool=True,
+                   observer: "QRObserver"=None) -> "tuple[np.ndarray, int]":
+    """
+    Calcula apenas os autovalores de uma matriz tridiagonal simétrica por meio de iterações QR
+    livres de raízes quadradas (Pal-Walker-Kahan). Não há acumulação de autovetores, de modo
+    que a memória utilizada é O(n).
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica.
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        observer (QRObserver/None): recebe os eventos de cada iteração e deflação.
+
+    Returns:
+        tuple: vetor de autovalores, na ordem em que surgem na diagonal (primeira posição),
+        e o número total de iterações até a convergência (segunda posição).
+    """
+
+    alpha, beta = tridiagonal_vectors(A0)
+    beta2 = beta**2
+
+    n = alpha.shape[0]
+    k = 0 # Número de iterações até a convergência de todos os elementos
+
+    if observer is not None:
+        observer.start(n)
+
+    # Itera ao longo da diagonal principal (decrescente)
+    for m in range(n-1, 0, -1):
+        # Loop até a convergência de beta (|beta| < epsilon <=> beta^2 < epsilon^2)
+        while beta2[m-1] >= epsilon**2:
+            mu = wilkinson_shift(alpha[m-1], np.sqrt(beta2[m-1]), alpha[m]) if (shifted and k > 0) else 0.0
+            if observer is not None:
+                observer.iteration(k, m, mu, np.sqrt(beta2[m-1]))
+
+            pwk_sweep(alpha, beta2, mu, 0, m)
+
+            k += 1 # Nova iteração
+
+        beta2[m-1] = 0 # Quebra do laço while: beta convergiu (é nulo)
+        if observer is not None:
+            observer.deflation(m, alpha[m], k)
+
+    if observer is not None and n > 0:
+        observer.deflation(0, alpha[0], k)
+
+    return (alpha, k)
+
+
+def QR_out_of_core(A0: "np.ndarray | TridiagonalMatrix", path: str, epsilon: float=1e-6, shifted: bool=True,
+                   criterion: str='absolute', direction: str='down', buffer: int=2**20,
+                   block_bytes: int=2**26) -> "tuple[DiskEigenvectors, np.ndarray, int]":
+    """
+    Algoritmo QR implícito com a matriz de autovetores mantida em disco (ver DiskEigenvectors),
+    para cadeias cuja matriz V densa não cabe na memória. Em memória ficam apenas as diagonais,
+    até buffer rotações pendentes e um bloco de block_bytes bytes de V por vez. Ao final, o
+    arquivo está em ordem de colunas: cada intervalo de autovetores é lido de forma contígua.
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica a ser decomposta.
+        path (str): arquivo .npy em que V é criada (sobrescrito, se existir).
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        criterion (str): critério de deflação, 'absolute' ou 'relative' (ver negligible).
+        direction (str): 'down' (QR), 'up' (QL) ou 'auto' (ver QR_implicit).
+        buffer (int): número de rotações registradas antes de cada aplicação a V.
+        block_bytes (int): tamanho aproximado, em bytes, de cada bloco de linhas de V.
+
+    Returns:
+        tuple: matriz V em disco (primeira posição), vetor de autovalores (segunda posição) e
+        número total de iterações até a convergência (terceira posição).
+    """
+
+    alpha, beta = tridiagonal_vectors(A0)
+
+    V = DiskEigenvectors(path, alpha.shape[0], buffer, block_bytes)
+    k = QR_implicit(alpha, beta, epsilon, shifted, V, None, criterion, direction)
+    V.finalize() # Autovetores contíguos no arquivo
+
+    return (V, alpha, k)
+
+
+class QRObserver:
+    """
+    Interface de observação das iterações do algoritmo QR. Os métodos abaixo são chamados
+    pelo algoritmo e não fazem nada por padrão: basta sobrescrever os de interesse.
+    Quando nenhum observador é fornecido, o algoritmo não realiza chamada alguma.
+    """
+
+    def start(self, n: int) -> None:
+        """Chamado antes da primeira iteração, com a dimensão n da matriz."""
+
+    def iteration(self, k: int, m: int, mu: float, beta: float) -> None:
+        """Chamado a cada iteração k, com a base m do bloco ativo, o deslocamento mu e |A[m, m-1]|."""
+
+    def deflation(self, m: int, eigenvalue: float, k: int) -> None:
+        """Chamado quando o autovalor da posição m converge, após k iterações no total."""
+
+    def hit(self, eigenvalues: np.ndarray, k: int) -> None:
+        """Chamado por cached_QR, no lugar dos demais eventos, quando a decomposição vem do cache
+        (com os autovalores e o total k de iterações do cálculo original)."""
+
+
+class QRTrace(QRObserver):
+    """
+    Registro leve das iterações do algoritmo QR: base do bloco ativo, deslocamento e |beta| de
+    cada iteração e, para cada autovalor convergido, a posição, o valor, a iteração e o tempo
+    decorrido desde a convergência anterior (ou desde o início).
+    """
+
+    def __init__(self):
+        self.m = []
+        self.mu = []
+        self.beta = []
+
+        self.deflated = []    # Posições dos autovalores convergidos
+        self.eigenvalues = [] # Valores dos autovalores convergidos
+        self.k = []           # Iteração em que cada autovalor convergiu
+        self.elapsed = []     # Tempo (s) até a convergência de cada autovalor
+
+        self.cached = False   # Se a decomposição veio do cache (sem eventos de iteração)
+
+        self._clock = None
+
+    def start(self, n: int) -> None:
+        self._clock = time.perf_counter()
+
+    def iteration(self, k: int, m: int, mu: float, beta: float) -> None:
+        self.m.append(m)
+        self.mu.append(mu)
+        self.beta.append(beta)
+
+    def deflation(self, m: int, eigenvalue: float, k: int) -> None:
+        now = time.perf_counter()
+
+        self.deflated.append(m)
+        self.eigenvalues.append(eigenvalue)
+        self.k.append(k)
+        self.elapsed.append(now - self._clock)
+
+        self._clock = now
+
+    def hit(self, eigenvalues: np.ndarray, k: int) -> None:
+        self.cached = True
+
+    def iterations_per_eigenvalue(self) -> np.ndarray:
+        """
+        Retorna o número de iterações gastas até a convergência de cada autovalor registrado.
+        """
+
+        return np.diff(self.k, prepend=0)
+
+    def summary(self) -> dict:
+        """
+        Retorna um dicionário de listas, no formato de print_table, com uma linha por autovalor.
+        """
+
+        return {
+            'Posição' : self.deflated,
+            'Autovalor' : [f"{value:.6g}" for value in self.eigenvalues],
+            'Iterações' : self.iterations_per_eigenvalue().tolist(),
+            'Tempo (s)' : [f"{value:.2e}" for value in self.elapsed]
+        }
+
+
+def QR(A0: "np.ndarray | TridiagonalMatrix", epsilon: float=1e-6, shifted: bool=True, method: str='explicit',
+       workers: int=1, observer: QRObserver=None, accumulate: str='dense', criterion: str='absolute',
+       direction: str='down') -> "tuple[np.ndarray, np.ndarray, int]":
+    """
+    Por meio de decomposições QR com deslocamento espectral, calcula as matrizes Lambda e V tais que
+    V @ Lambda @ V.T == A0, sendo:
+    
+    - A0: tridiagonal simétrica;
+    - V: ortonormal, cujas colunas são autovetores de A0;
+    - Lambda: tridiagonal simétrica, cuja diagonal principal são autovalores de A0. 
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica a ser decomposta.
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        method (str): 'explicit' para a fatoração com matrizes densas ou 'implicit' para
+                      iterações com deslocamento implícito sobre as diagonais (O(n) por iteração).
+        workers (int/None): número de processos para resolver, concorrentemente, os blocos
+                            independentes da matriz (somente para method='implicit'); se None,
+                            utiliza o número de núcleos disponíveis.
+        observer (QRObserver/None): recebe os eventos de cada iteração e deflação (por exemplo,
+                                    um QRTrace); se fornecido, os blocos são resolvidos no
+                                    processo principal, sem paralelismo.
+        accumulate (str): 'dense' para acumular V explicitamente ou 'log' para retornar, no lugar
+                          de V, um RotationLog que aplica V ou V.T por meio das rotações registradas
+                          (somente para method='implicit', sem paralelismo).
+        criterion (str): critério de deflação: 'absolute' (|beta| < epsilon) ou 'relative'
+                         (|beta| <= epsilon * sqrt(|alpha_i * alpha_j|) para seus vizinhos na diagonal).
+        direction (str): 'down' (QR, converge pela base), 'up' (QL, converge pelo topo) ou 'auto'
+                         (cada bloco converge pela extremidade de menor |alpha|); somente para
+                         method='implicit'.
+
+    Returns:
+        tuple: tupla com a matriz V (primeira posição), a matriz Lambda (segunda posição) e o número
+        total de iterações até a convergência (terceira posição).
+    """
+
+    if accumulate not in ['dense', 'log']:
+        raise ValueError(f"Erro: `accumulate` deve ser 'dense' ou 'log' e não {accumulate}.")
+    if accumulate == 'log' and method != 'implicit':
+        raise ValueError("Erro: `accumulate='log'` requer `method='implicit'`.")
+    if criterion not in ['absolute', 'relative']:
+        raise ValueError(f"Erro: `criterion` deve ser 'absolute' ou 'relative' e não {criterion}.")
+    if direction not in ['down', 'up', 'auto']:
+        raise ValueError(f"Erro: `direction` deve ser 'down', 'up' ou 'auto' e não {direction}.")
+    if direction != 'down' and method != 'implicit':
+        raise ValueError(f"Erro: `direction='{direction}'` requer `method='implicit'`.")
+
+    if method == 'implicit':
+        alpha, beta = tridiagonal_vectors(A0)
+
+        if accumulate == 'log':
+            V = RotationLog(alpha.shape[0])
+            k = QR_implicit(alpha, beta, epsilon, shifted, V, observer, criterion, direction)
+        elif workers == 1 or observer is not None:
+            V = np.eye(alpha.shape[0], order='F')
+            k = QR_implicit(alpha, beta, epsilon, shifted, V, observer, criterion, direction)
+        else:
+            V, alpha, k = QR_parallel(alpha, beta, epsilon, shifted, workers, criterion, direction)
+
+        return (V, np.diag(alpha), k)
+
+    elif method != 'explicit':
+        raise ValueError(f"Erro: `method` deve ser 'explicit' ou 'implicit' e não {method}.")
+
+    # A fatoração explícita opera sobre a matriz densa
+    if isinstance(A0, TridiagonalMatrix):
+        A0 = A0.to_dense()
+
+    n = A0.shape[0]
+    k = 0 # Número de iterações até a convergência de todos os elementos
+
+    A = np.copy(A0) # Operações não in-place
+    V = np.eye(n, order='F') # Inicializa matriz de autovetores (colunas contíguas)
+    I = np.eye(n)
+    work = np.empty((2, n)) # Memória auxiliar para as rotações
+
+    if observer is not None:
+        observer.start(n)
+
+    # Itera ao longo da diagonal principal (decrescente)
+    for m in range(n-1, 0, -1):
+        # Loop até a convergência de beta
+        while not negligible(A[m-1, m-1], A[m, m], A[m, m-1], epsilon, criterion): 
+            mu = wilkinson_shift(A[m-1, m-1], A[m, m-1], A[m, m]) if (shifted and k > 0) else 0.0
+            if observer is not None:
+                observer.iteration(k, m, mu, np.abs(A[m, m-1]))
+
+            Q, R = givens_rotation(A - mu*I, V, work) # Acumula V = V @ Q in-place
+            
+            # Atualiza as matrizes
+            A = R @ Q + mu*I
+
+            k += 1 # Nova iteração
+
+        A[m, m-1] = 0 # Quebra do laço while: beta convergiu (é nulo)
+        if observer is not None:
+            observer.deflation(m, A[m, m], k)
+
+    if observer is not None and n > 0:
+        observer.deflation(0, A[0, 0], k)
+    
+    Lambda = A
+    
+    return (V, Lambda, k)
+
+
+# ============================================= #
+# Cache de decomposições                        #
+# ============================================= #
+
+class DecompositionCache:
+    """
+    Cache de decomposições espectrais endereçado pelo conteúdo: a chave é o hash (SHA-256)
+    das diagonais da matriz e dos parâmetros do algoritmo. Mantém em memória as entradas
+    usadas mais recentemente (LRU), limitadas a max_bytes, e, opcionalmente, persiste cada
+    entrada num arquivo .npz em directory, de modo que sobrevivam ao fim da execução.
+    """
+
+    def __init__(self, max_bytes: int=256 * 2**20, directory: str=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+
+        self.entries = OrderedDict() # Chave --> (V, diagonais de Lambda, k)
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(A0: "np.ndarray | TridiagonalMatrix", **params) -> str:
+        """
+        Calcula a chave de uma matriz e de um conjunto de parâmetros do algoritmo.
+        """
+
+        alpha, beta = tridiagonal_vectors(A0)
+
+        digest = hashlib.sha256()
+        digest.update(alpha.tobytes())
+        digest.update(beta.tobytes())
+        digest.update(repr(sorted(params.items())).encode())
+
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str) -> "tuple | None":
+        """
+        Retorna a decomposição (V, Lambda, k) associada à chave (da memória ou do disco) ou None.
+        """
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.expand(self.entries[key])
+
+        if self.directory is not None and os.path.exists(self.path(key)):
+            with np.load(self.path(key)) as data:
+                self.insert(key, (data['V'], data['diagonals'], int(data['k'])))
+            self.hits += 1
+            return self.expand(self.entries[key])
+
+        self.misses += 1
+
+        return None
+
+    def put(self, key: str, value: tuple) -> tuple:
+        """
+        Armazena uma decomposição (V, Lambda, k) em memória e, se configurado, em disco.
+        De Lambda (tridiagonal), somente as três diagonais são armazenadas, numa matriz 3 x n;
+        V e as diagonais tornam-se somente leitura, pois são compartilhadas.
+        """
+
+        V, Lambda, k = value
+
+        n = Lambda.shape[0]
+        diagonals = np.zeros((3, n))
+        diagonals[0, :n-1] = np.diagonal(Lambda, -1) # Abaixo da principal
+        diagonals[1] = np.diagonal(Lambda)           # Principal (autovalores)
+        diagonals[2, :n-1] = np.diagonal(Lambda, 1)  # Acima da principal
+
+        self.insert(key, (V, diagonals, k))
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+            # Escrita atômica: arquivo temporário (próprio do processo) renomeado ao final
+            temp = f"{self.path(key)}.{os.getpid()}.tmp"
+            with open(temp, 'wb') as file:
+                np.savez(file, V=V, diagonals=diagonals, k=k)
+            os.replace(temp, self.path(key))
+
+        return self.expand(self.entries[key])
+
+    @staticmethod
+    def expand(entry: tuple) -> tuple:
+        """
+        Reconstrói a decomposição (V, Lambda, k) de uma entrada (V, diagonais de Lambda, k).
+        """
+
+        V, diagonals, k = entry
+
+        n = diagonals.shape[1]
+        Lambda = np.diag(diagonals[1])
+        Lambda[np.arange(1, n), np.arange(n-1)] = diagonals[0, :n-1]
+        Lambda[np.arange(n-1), np.arange(1, n)] = diagonals[2, :n-1]
+
+        return (V, Lambda, k)
+
+    def insert(self, key: str, value: tuple) -> None:
+        V, diagonals, k = value
+        V.setflags(write=False)
+        diagonals.setflags(write=False)
+
+        if key in self.entries:
+            self.nbytes -= self.entries[key][0].nbytes + self.entries[key][1].nbytes
+
+        self.entries[key] = (V, diagonals, k)
+        self.entries.move_to_end(key)
+        self.nbytes += V.nbytes + diagonals.nbytes
+
+        # Remove as entradas menos usadas recentemente (mantendo ao menos a atual)
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            _, (V_old, diagonals_old, _) = self.entries.popitem(last=False)
+            self.nbytes -= V_old.nbytes + diagonals_old.nbytes
+
+    def clear(self) -> None:
+        """
+        Esvazia o cache em memória (os arquivos em disco são mantidos).
+        """
+
+        self.entries.clear()
+        self.nbytes = 0
+
+
+decomposition_cache = DecompositionCache() # Cache padrão do módulo
+
+
+def cached_QR(A0: "np.ndarray | TridiagonalMatrix", epsilon: float=1e-6, shifted: bool=True, method: str='explicit',
+              cache: DecompositionCache=None, criterion: str='absolute', direction: str='down',
+              **kwargs) -> "tuple[np.ndarray, np.ndarray, int]":
+    """
+    Versão de QR que consulta um cache de decomposições antes de calcular. A chave considera
+    as diagonais de A0, epsilon, shifted, method, criterion e direction; demais argumentos
+    (que não alteram o resultado, como workers) são repassados a QR. Com accumulate='log',
+    V é um RotationLog, que não é armazenado: QR é sempre executado. Num acerto do cache, um
+    observer recebido em kwargs é notificado somente pelo evento hit, pois não há iterações.
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica a ser decomposta.
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        method (str): 'explicit' ou 'implicit', como em QR.
+        cache (DecompositionCache/None): cache a ser utilizado; se None, utiliza o cache do módulo.
+        criterion (str): critério de deflação, como em QR.
+        direction (str): sentido das iterações, como em QR.
+
+    Returns:
+        tuple: tupla (V, Lambda, k) como em QR; V é somente leitura e Lambda é reconstruída a
+        partir de suas diagonais armazenadas.
+    """
+
+    # Somente matrizes densas são armazenadas no cache
+    if kwargs.get('accumulate', 'dense') != 'dense':
+        return QR(A0, epsilon, shifted, method, criterion=criterion, direction=direction, **kwargs)
+
+    if cache is None:
+        cache = decomposition_cache
+
+    key = cache.key(A0, epsilon=float(epsilon), shifted=bool(shifted), method=method,
+                    criterion=criterion, direction=direction)
+    value = cache.get(key)
+
+    if value is None:
+        value = cache.put(key, QR(A0, epsilon, shifted, method, criterion=criterion, direction=direction, **kwargs))
+    elif kwargs.get('observer') is not None:
+        kwargs['observer'].hit(np.diagonal(value[1]), value[2])
+
+    return value
+
+
+# ============================================= #
+# Divisão e conquista                           #
+# ============================================= #
+
+def secular_roots(d: np.ndarray, z: np.ndarray, rho: float) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Resolve a equação secular 1 + rho * sum(z**2 / (d - lambda)) = 0 para todas as raízes,
+    com d estritamente crescente, z sem elementos nulos e rho > 0. Cada raiz é procurada
+    relativamente ao polo (elemento de d) mais próximo, por meio de passos de Newton
+    protegidos por bissecção, de modo que as diferenças d - lambda são obtidas com precisão.
+
+    Args:
+        d (np.ndarray): polos da equação secular (diagonal de D), em ordem crescente.
+        z (np.ndarray): vetor de acoplamento.
+        rho (float): peso do termo de posto 1.
+
+    Returns:
+        tuple: vetor de raízes (primeira posição) e matriz delta tal que
+        delta[j, i] = d[j] - lambda[i] (segunda posição).
+    """
+
+    k = d.shape[0]
+    z2 = z**2
+
+    # Intervalos (d[i], d[i+1]) e, para a última raiz, (d[k-1], d[k-1] + rho*||z||^2)
+    right = np.append(d[1:], d[-1] + rho * np.sum(z2))
+    mid = (d + right) / 2.0
+
+    # Escolhe como origem o polo mais próximo da raiz
+    f_mid = 1.0 + rho * np.sum(z2[:, None] / (d[:, None] - mid[None, :]), axis=0)
+    origin_idx = np.where((f_mid >= 0.0) | (np.arange(k) == k-1), np.arange(k), np.arange(k) + 1)
+    origin_idx = np.minimum(origin_idx, k-1)
+    origin = d[origin_idx]
+
+    delta = d[:, None] - origin[None, :] # Distâncias aos polos de origem
+    tau_lo = d - origin                  # Intervalo de busca relativo à origem
+    tau_hi = right - origin
+    tau = (tau_lo + tau_hi) / 2.0
+
+    active = np.ones(k, dtype=bool)
+    eps = np.finfo(float).eps
+
+    for _ in range(200):
+        idx = np.flatnonzero(active)
+        if idx.shape[0] == 0:
+            break
+
+        diff = delta[:, idx] - tau[idx]
+        ratio = z2[:, None] / diff
+        f = 1.0 + rho * np.sum(ratio, axis=0)
+        df = rho * np.sum(ratio / diff, axis=0)
+
+        # Atualiza o intervalo que contém a raiz (f é crescente em cada intervalo)
+        positive = f > 0.0
+        tau_hi[idx[positive]] = tau[idx[positive]]
+        tau_lo[idx[~positive]] = tau[idx[~positive]]
+
+        # Passo de Newton, substituído pela bissecção se sair do intervalo
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau_new = tau[idx] - f / df
+        outside = ~((tau_new >= tau_lo[idx]) & (tau_new <= tau_hi[idx]))
+        tau_new[outside] = (tau_lo[idx][outside] + tau_hi[idx][outside]) / 2.0
+        tau_new[f == 0.0] = tau[idx][f == 0.0] # Raiz exata
+
+        step = np.abs(tau_new - tau[idx])
+        width = tau_hi[idx] - tau_lo[idx]
+        tau[idx] = tau_new
+
+        scale = np.maximum(np.abs(tau_new), np.abs(origin[idx]) * eps)
+        active[idx[(step <= 2.0*eps*scale) | (width <= 4.0*eps*scale) | (f == 0.0)]] = False
+
+    delta -= tau[None, :]
+
+    return (origin + tau, delta)
+
+
+def rank_one_update(d: np.ndarray, z: np.ndarray, rho: float, Q: np.ndarray) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Calcula a decomposição espectral de Q @ (diag(d) + rho * z @ z.T) @ Q.T, etapa de união
+    do método de divisão e conquista de Cuppen. Componentes de z desprezíveis e polos
+    praticamente coincidentes são deflacionados antes da solução da equação secular.
+
+    Args:
+        d (np.ndarray): autovalores dos subproblemas.
+        z (np.ndarray): vetor de acoplamento nas bases dos subproblemas.
+        rho (float): elemento de beta removido na divisão.
+        Q (np.ndarray): matriz ortonormal (bloco diagonal) com os autovetores dos subproblemas.
+
+    Returns:
+        tuple: matriz de autovetores (primeira posição) e vetor de autovalores em ordem
+        crescente (segunda posição).
+    """
+
+    # Garante rho > 0: autovalores de -(diag(-d) + |rho| z z^T)
+    flip = rho < 0.0
+    if flip:
+        d = -d
+        rho = -rho
+
+    # Normaliza z, incorporando sua norma em rho
+    z_norm = np.sqrt(np.sum(z**2))
+    z = z / z_norm
+    rho = rho * z_norm**2
+
+    order = np.argsort(d, kind='stable')
+    d, z, Q = d[order], z[order], Q[:, order]
+
+    tol = 8.0 * np.finfo(float).eps * max(np.max(np.abs(d)), rho)
+
+    # Deflação: componentes de z desprezíveis
+    deflated = np.abs(rho * z) <= tol
+
+    # Deflação: polos próximos (rotaciona o par para anular uma componente de z)
+    prev = -1
+    for j in np.flatnonzero(~deflated):
+        if prev >= 0:
+            r = np.hypot(z[prev], z[j])
+            c, s = z[j] / r, -z[prev] / r
+
+            if np.abs(c * s * (d[j] - d[prev])) <= tol:
+                q_prev, q_j = Q[:, prev].copy(), Q[:, j].copy()
+                Q[:, prev] = c*q_prev + s*q_j
+                Q[:, j] = -s*q_prev + c*q_j
+
+                d_prev, d_j = d[prev], d[j]
+                d[prev] = c*c*d_prev + s*s*d_j
+                d[j] = s*s*d_prev + c*c*d_j
+
+                z[prev] = 0.0
+                z[j] = r
+                deflated[prev] = True
+
+        prev = j
+
+    keep = np.flatnonzero(~deflated)
+    eigvals = np.copy(d)
+    V = Q # Colunas deflacionadas já são autovetores
+
+    if keep.shape[0] > 0:
+        # Reordena os polos remanescentes (rotações podem perturbar a ordem)
+        keep = keep[np.argsort(d[keep], kind='stable')]
+        d_k, z_k = d[keep], z[keep]
+
+        lam, delta = secular_roots(d_k, z_k, rho)
+
+        # Recalcula z (Gu-Eisenstat) para garantir a ortogonalidade dos autovetores
+        poles = d_k[None, :] - d_k[:, None]
+        np.fill_diagonal(poles, 1.0)
+        log_z2 = np.sum(np.log(np.abs(delta)), axis=1) - np.sum(np.log(np.abs(poles)), axis=1) - np.log(rho)
+        z_hat = np.sign(z_k) * np.exp(log_z2 / 2.0)
+
+        U = z_hat[:, None] / delta
+        U /= np.sqrt(np.sum(U**2, axis=0))
+
+        eigvals[keep] = lam
+        V = np.copy(Q)
+        V[:, keep] = Q[:, keep] @ U
+
+    if flip:
+        eigvals = -eigvals
+
+    order = np.argsort(eigvals, kind='stable')
+
+    return (V[:, order], eigvals[order])
+
+
+def dc_leaf(alpha: np.ndarray, beta: np.ndarray, epsilon: float, shifted: bool) -> "tuple[np.ndarray, np.ndarray, int]":
+    """
+    Resolve um subproblema do método de divisão e conquista por meio do algoritmo QR implícito,
+    retornando os autopares em ordem crescente de autovalores.
+
+    Args:
+        alpha (np.ndarray): diagonal principal do subproblema.
+        beta (np.ndarray): diagonal abaixo da principal do subproblema.
+        epsilon (float): precisão mínima para determinação da convergência.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+
+    Returns:
+        tuple: autovetores (primeira posição), autovalores (segunda posição) e número de
+        iterações (terceira posição).
+    """
+
+    V, eigvals, k = QR_block(alpha, beta, epsilon, shifted)
+    order = np.argsort(eigvals, kind='stable')
+
+    return (V[:, order], eigvals[order], k)
+
+
+def dc_merge(left: tuple, right: tuple, rho: float) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Une as decomposições de dois subproblemas adjacentes, restaurando o elemento rho de beta
+    removido entre eles.
+
+    Args:
+        left (tuple): autovetores e autovalores do subproblema superior.
+        right (tuple): autovetores e autovalores do subproblema inferior.
+        rho (float): elemento de beta entre os subproblemas.
+
+    Returns:
+        tuple: autovetores (primeira posição) e autovalores (segunda posição) da união.
+    """
+
+    Q1, d1 = left
+    Q2, d2 = right
+    n1, n2 = d1.shape[0], d2.shape[0]
+
+    Q = np.zeros((n1+n2, n1+n2))
+    Q[:n1, :n1] = Q1
+    Q[n1:, n1:] = Q2
+
+    # z = Q.T @ u, com u não nulo somente na fronteira entre os subproblemas
+    z = np.concatenate((Q1[-1, :], Q2[0, :]))
+
+    return rank_one_update(np.concatenate((d1, d2)), z, rho, Q)
+
+
+def divide_and_conquer(A0: "np.ndarray | TridiagonalMatrix", epsilon: float=1e-6, shifted: bool=True, min_size: int=32,
+                       workers: int=1) -> "tuple[np.ndarray, np.ndarray, int]":
+    """
+    Calcula as matrizes V e Lambda tais que V @ Lambda @ V.T == A0 pelo método de divisão e
+    conquista de Cuppen: a matriz é dividida, removendo elementos de beta, em subproblemas de
+    dimensão até min_size (resolvidos pelo algoritmo QR), cujas decomposições são unidas por
+    atualizações de posto 1 (equação secular), com deflação de autovalores próximos.
+
+    Os subproblemas são resolvidos concorrentemente em um conjunto de processos e as uniões
+    de um mesmo nível em um conjunto de threads (as operações do NumPy liberam o GIL).
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica a ser decomposta.
+        epsilon (float): precisão mínima para a convergência do algoritmo QR nos subproblemas.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais nos subproblemas.
+        min_size (int): dimensão máxima dos subproblemas resolvidos diretamente pelo algoritmo QR.
+        workers (int/None): número de processos e threads; se None, utiliza o número de núcleos disponíveis.
+
+    Returns:
+        tuple: tupla com a matriz V (primeira posição), a matriz Lambda, com autovalores em ordem
+        crescente (segunda posição), e o total de iterações QR nos subproblemas (terceira posição).
+    """
+
+    if min_size < 2:
+        raise ValueError(f"Erro: `min_size` deve ser ao menos 2 e não {min_size}.")
+
+    alpha, beta = tridiagonal_vectors(A0)
+    n = alpha.shape[0]
+
+    # Divide em 2^p subproblemas de dimensão até min_size (e ao menos 1)
+    leaves = 1
+    while n / leaves > min_size and 2*leaves <= n:
+        leaves *= 2
+    bounds = np.linspace(0, n, leaves+1).astype(int)
+
+    # Remove beta nas fronteiras: T = diag(T1', T2', ...) + sum(rho * u @ u.T)
+    alpha_torn = np.copy(alpha)
+    rhos = beta[bounds[1:-1] - 1]
+    alpha_torn[bounds[1:-1] - 1] -= rhos
+    alpha_torn[bounds[1:-1]] -= rhos
+
+    tasks = [(alpha_torn[lo:hi], beta[lo:hi-1], epsilon, shifted) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    if leaves == 1 or workers == 1:
+        results = [dc_leaf(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(dc_leaf, *zip(*tasks)))
+
+    k = sum(result[2] for result in results)
+    nodes = [result[:2] for result in results]
+    rhos = rhos.tolist()
+
+    # Une os subproblemas adjacentes, nível a nível
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while len(nodes) > 1:
+            nodes = list(executor.map(dc_merge, nodes[0::2], nodes[1::2], rhos[0::2]))
+            rhos = rhos[1::2]
+
+    V, eigvals = nodes[0]
+
+    return (V, np.diag(eigvals), k)
+
+
+# ============================================= #
+# Autopares selecionados                        #
+# ============================================= #
+
+def sturm_count(alpha: np.ndarray, beta: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Conta, por meio da sequência de Sturm (pivôs da fatoração LDL.T de T - x*I), quantos
+    autovalores da matriz tridiagonal simétrica são menores que cada valor de x.
+
+    Args:
+        alpha (np.ndarray): diagonal principal.
+        beta (np.ndarray): diagonal abaixo da principal.
+        x (np.ndarray): valores a serem comparados com os autovalores (vetorizado).
+
+    Returns:
+        np.ndarray: número de autovalores menores que cada elemento de x.
+    """
+
+    beta2 = beta**2
+    pivmin = np.finfo(float).tiny * max(1.0, np.max(beta2, initial=0.0))
+
+    q = alpha[0] - x
+    q[np.abs(q) < pivmin] = -pivmin
+    count = (q < 0.0).astype(int)
+
+    for i in range(1, alpha.shape[0]):
+        q = alpha[i] - x - beta2[i-1] / q
+        q[np.abs(q) < pivmin] = -pivmin # Evita a divisão por zero
+        count += q < 0.0
+
+    return count
+
+
+def bisect_eigenvalues(alpha: np.ndarray, beta: np.ndarray, indices: np.ndarray, tol: float=None) -> np.ndarray:
+    """
+    Calcula, por bissecção com contagens de Sturm vetorizadas, os autovalores de índices
+    dados (em ordem crescente, a partir de zero) de uma matriz tridiagonal simétrica.
+
+    Args:
+        alpha (np.ndarray): diagonal principal.
+        beta (np.ndarray): diagonal abaixo da principal.
+        indices (np.ndarray): índices dos autovalores desejados.
+        tol (float/None): largura máxima do intervalo final; se None, utiliza a precisão de máquina.
+
+    Returns:
+        np.ndarray: autovalores correspondentes aos índices.
+    """
+
+    # Intervalo inicial pelos discos de Gershgorin
+    radius = np.abs(np.append(beta, 0.0)) + np.abs(np.insert(beta, 0, 0.0))
+    lower = np.full(indices.shape[0], np.min(alpha - radius))
+    upper = np.full(indices.shape[0], np.max(alpha + radius))
+
+    norm = max(np.abs(lower[0]), np.abs(upper[0]))
+    if tol is None:
+        tol = 2.0 * np.finfo(float).eps * norm
+
+    active = np.ones(indices.shape[0], dtype=bool)
+
+    while active.any():
+        idx = np.flatnonzero(active)
+        mid = (lower[idx] + upper[idx]) / 2.0
+
+        # Intervalo já não pode ser dividido em aritmética de ponto flutuante
+        exhausted = (mid <= lower[idx]) | (mid >= upper[idx])
+
+        # Mais de j autovalores abaixo de mid: o j-ésimo está à esquerda
+        left = sturm_count(alpha, beta, mid) > indices[idx]
+        upper[idx[left]] = mid[left]
+        lower[idx[~left]] = mid[~left]
+
+        width = upper[idx] - lower[idx]
+        active[idx[(width <= tol) | exhausted]] = False
+
+    return (lower + upper) / 2.0
+
+
+def tridiagonal_factor(alpha: np.ndarray, beta: np.ndarray, shifts: np.ndarray) -> tuple:
+    """
+    Fatora simultaneamente as matrizes T - shift*I (uma por deslocamento) por eliminação
+    gaussiana com pivoteamento parcial, em O(n) por matriz. Pivôs nulos são perturbados,
+    de modo que a fatoração é utilizável mesmo quando shift é um autovalor de T.
+
+    Args:
+        alpha (np.ndarray): diagonal principal de T.
+        beta (np.ndarray): diagonal abaixo da principal de T.
+        shifts (np.ndarray): deslocamentos, um por matriz.
+
+    Returns:
+        tuple: fatoração (multiplicadores, trocas de linhas e as três diagonais de U),
+        cada uma de formato (n, número de deslocamentos).
+    """
+
+    n, m = alpha.shape[0], shifts.shape[0]
+    pivmin = np.finfo(float).eps * max(np.max(np.abs(alpha)), np.max(np.abs(beta), initial=0.0), np.finfo(float).tiny)
+
+    mult = np.zeros((n, m))
+    swap = np.zeros((n, m), dtype=bool)
+    U = np.zeros((3, n, m)) # Diagonal principal e duas diagonais acima dela
+
+    # Linha pivô corrente (colunas i, i+1 e i+2)
+    u0 = alpha[0] - shifts
+    u1 = np.full(m, beta[0] if n > 1 else 0.0)
+    u2 = np.zeros(m)
+
+    for i in range(0, n-1):
+        # Linha i+1 (colunas i, i+1 e i+2)
+        l = beta[i]
+        d = alpha[i+1] - shifts
+        e = beta[i+1] if i < n-2 else 0.0
+
+        swap[i] = np.abs(l) > np.abs(u0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mult[i] = np.where(swap[i], u0 / l, l / u0)
+        mult[i][~np.isfinite(mult[i])] = 0.0
+
+        U[0, i] = np.where(swap[i], l, u0)
+        U[1, i] = np.where(swap[i], d, u1)
+        U[2, i] = np.where(swap[i], e, u2)
+
+        u0, u1, u2 = (np.where(swap[i], u1 - mult[i]*d, d - mult[i]*u1),
+                      np.where(swap[i], u2 - mult[i]*e, e - mult[i]*u2),
+                      np.zeros(m))
+
+    U[0, n-1] = u0
+
+    # Perturba pivôs nulos
+    small = np.abs(U[0]) < pivmin
+    U[0][small] = np.where(U[0][small] < 0.0, -pivmin, pivmin)
+
+    return (mult, swap, U)
+
+
+def tridiagonal_solve(factors: tuple, B: np.ndarray) -> np.ndarray:
+    """
+    Resolve os sistemas (T - shift*I) @ x = b, coluna a coluna, a partir da fatoração
+    obtida por tridiagonal_factor, em O(n) por sistema.
+
+    Args:
+        factors (tuple): fatoração retornada por tridiagonal_factor.
+        B (np.ndarray): termos independentes, de formato (n, número de deslocamentos).
+
+    Returns:
+        np.ndarray: soluções dos sistemas, de formato (n, número de deslocamentos).
+    """
+
+    mult, swap, U = factors
+    n = B.shape[0]
+    X = np.array(B, dtype=float)
+
+    # Substituição direta (L), aplicando as trocas de linhas
+    for i in range(0, n-1):
+        xi, xj = X[i].copy(), X[i+1].copy()
+        X[i] = np.where(swap[i], xj, xi)
+        X[i+1] = np.where(swap[i], xi - mult[i]*xj, xj - mult[i]*xi)
+
+    # Substituição inversa (U)
+    X[n-1] /= U[0, n-1]
+    if n > 1:
+        X[n-2] = (X[n-2] - U[1, n-2]*X[n-1]) / U[0, n-2]
+    for i in range(n-3, -1, -1):
+        X[i] = (X[i] - U[1, i]*X[i+1] - U[2, i]*X[i+2]) / U[0, i]
+
+    return X
+
+
+def eigenvalue_clusters(alpha: np.ndarray, beta: np.ndarray, eigvals: np.ndarray, tol: float=1e-3,
+                        relative: bool=False, max_size: int=32) -> "list[np.ndarray]":
+    """
+    Agrupa autovalores próximos, cujos autovetores, obtidos por iteração inversa, devem ser
+    reortogonalizados: vizinhos (em ordem crescente) separados por menos de tol vezes uma
+    estimativa da norma da matriz ou, se relative, por menos de tol vezes o maior dos dois
+    em módulo. Grupos maiores que max_size são divididos em grupos consecutivos de até
+    max_size autovalores, limitando o custo da reortogonalização a O(n max_size^2).
+
+    Args:
+        alpha (np.ndarray): diagonal principal.
+        beta (np.ndarray): diagonal abaixo da principal.
+        eigvals (np.ndarray): autovalores, em qualquer ordem.
+        tol (float): separação mínima entre grupos, absoluta (em unidades da norma) ou relativa.
+        relative (bool): usa a separação relativa (True) ou absoluta (False).
+        max_size (int): número máximo de autovalores por grupo.
+
+    Returns:
+        list: vetores com as posições (em eigvals) dos autovalores de cada grupo com mais de
+        um elemento.
+    """
+
+    order = np.argsort(eigvals, kind='stable')
+    sorted_vals = eigvals[order]
+
+    norm = max(np.max(np.abs(alpha)) + 2.0*np.max(np.abs(beta), initial=0.0), np.finfo(float).tiny)
+    if relative:
+        # Autovalores nulos são comparados à escala da matriz na precisão de float64
+        scale = np.maximum(np.maximum(np.abs(sorted_vals[:-1]), np.abs(sorted_vals[1:])), np.finfo(float).eps * norm)
+    else:
+        scale = norm
+
+    clusters = np.split(order, np.flatnonzero(np.diff(sorted_vals) > tol * scale) + 1)
+
+    return [chunk for cluster in clusters for chunk in np.split(cluster, np.arange(max_size, cluster.shape[0], max_size))
+            if chunk.shape[0] > 1]
+
+
+def selected_eigenpairs(A0: "np.ndarray | TridiagonalMatrix", indices: "tuple[int, int]"=None, interval: "tuple[float, float]"=None,
+                        iterations: int=3) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Calcula somente os autopares de uma matriz tridiagonal simétrica cujos autovalores têm
+    índices (em ordem crescente) num intervalo ou pertencem a um intervalo de valores.
+    Os autovalores são obtidos por bissecção com sequências de Sturm e os autovetores por
+    iteração inversa, com reortogonalização entre autovalores próximos.
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica.
+        indices (tuple/None): índices (il, iu), inclusivos e a partir de zero, dos autovalores.
+        interval (tuple/None): intervalo (vl, vu] dos valores dos autovalores.
+        iterations (int): número de passos da iteração inversa.
+
+    Returns:
+        tuple: autovalores em ordem crescente (primeira posição) e matriz cujas colunas são
+        os respectivos autovetores (segunda posição).
+    """
+
+    # XOR: somente um desses deve ser None
+    assert (indices is None) != (interval is None)
+
+    alpha, beta = tridiagonal_vectors(A0)
+    n = alpha.shape[0]
+
+    if indices is None:
+        il, iu = sturm_count(alpha, beta, np.array(interval, dtype=float))
+        indices = np.arange(il, iu)
+    else:
+        indices = np.arange(indices[0], indices[1]+1)
+
+    if indices.shape[0] == 0:
+        return (np.empty(0), np.empty((n, 0)))
+
+    eigvals = bisect_eigenvalues(alpha, beta, indices)
+
+    clusters = eigenvalue_clusters(alpha, beta, eigvals)
+
+    # Iteração inversa a partir de um vetor inicial pseudoaleatório
+    factors = tridiagonal_factor(alpha, beta, eigvals)
+    V = np.random.default_rng(0).uniform(-1.0, 1.0, (n, eigvals.shape[0]))
+
+    for _ in range(iterations):
+        V = tridiagonal_solve(factors, V)
+        V = normalize(V)
+
+        for cluster in clusters:
+            V[:, cluster], _ = np.linalg.qr(V[:, cluster])
+
+    return (eigvals, V)
+
+
+# ============================================= #
+# Precisão mista                                #
+# ============================================= #
+
+def refine_eigenpairs(alpha: np.ndarray, beta: np.ndarray, V: np.ndarray, eigvals: np.ndarray,
+                      iterations: int=2) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Refina, em float64, aproximações dos autopares de uma matriz tridiagonal simétrica por
+    iteração do quociente de Rayleigh: a cada passo, o autovalor é estimado por v.T @ T @ v e
+    o autovetor por um passo de iteração inversa com esse deslocamento. Todos os autopares são
+    refinados simultaneamente, em O(n) por autopar e passo; autovetores de autovalores próximos
+    são reortogonalizados.
+
+    Args:
+        alpha (np.ndarray): diagonal principal de T (float64).
+        beta (np.ndarray): diagonal abaixo da principal de T (float64).
+        V (np.ndarray): autovetores aproximados (colunas).
+        eigvals (np.ndarray): autovalores aproximados.
+        iterations (int): número de passos de refinamento.
+
+    Returns:
+        tuple: autovetores (primeira posição) e autovalores (segunda posição) refinados, na
+        mesma ordem recebida.
+    """
+
+    T = TridiagonalMatrix(alpha, beta)
+    V = np.array(V, dtype=float)
+    eigvals = np.array(eigvals, dtype=float)
+
+    # Somente autovalores indistinguíveis em float32 (separação relativa de algumas unidades de
+    # arredondamento) têm autovetores iniciais sem direção própria
+    clusters = eigenvalue_clusters(alpha, beta, eigvals, tol=64 * float(np.finfo(np.float32).eps), relative=True)
+
+    for _ in range(iterations):
+        # Quociente de Rayleigh (os autovetores estão normalizados)
+        eigvals = np.sum(V * (T @ V), axis=0)
+
+        V = normalize(tridiagonal_solve(tridiagonal_factor(alpha, beta, eigvals), V))
+
+        for cluster in clusters:
+            V[:, cluster], _ = np.linalg.qr(V[:, cluster])
+
+    eigvals = np.sum(V * (T @ V), axis=0)
+
+    return (V, eigvals)
+
+
+def mixed_precision_QR(A0: "np.ndarray | TridiagonalMatrix", epsilon: float=None, shifted: bool=True,
+                       iterations: int=2, probes: int=8) -> "tuple[np.ndarray, np.ndarray, int, dict]":
+    """
+    Algoritmo QR em precisão mista: as iterações (e a acumulação de V, limitada pela largura de
+    banda da memória) são feitas em float32, com critério de deflação relativo e convergência
+    automática pela extremidade adequada; em seguida, cada autopar é refinado em float64 sobre
+    a matriz original (ver refine_eigenpairs). A precisão final é verificada e reportada.
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica a ser decomposta.
+        epsilon (float/None): precisão (relativa) da etapa em float32; valores abaixo de algumas
+                              vezes o épsilon de máquina de float32 são elevados a esse limite.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        iterations (int): número de passos de refinamento em float64.
+        probes (int): número de vetores de prova para o erro de ortogonalidade (ver verify).
+
+    Returns:
+        tuple: matriz V (primeira posição), matriz Lambda (segunda posição), número de iterações
+        em float32 (terceira posição) e verificação da decomposição final, como em verify
+        (quarta posição).
+    """
+
+    alpha, beta = tridiagonal_vectors(A0)
+
+    # Abaixo desse limite, a deflação em float32 não convergiria
+    limit = 4 * float(np.finfo(np.float32).eps)
+    epsilon = limit if epsilon is None else max(epsilon, limit)
+
+    alpha32 = alpha.astype(np.float32)
+    beta32 = beta.astype(np.float32)
+    V32 = np.eye(alpha.shape[0], dtype=np.float32, order='F') # Colunas contíguas (ver rotate_columns)
+
+    k = QR_implicit(alpha32, beta32, epsilon, shifted, V32, criterion='relative', direction='auto')
+
+    V, eigvals = refine_eigenpairs(alpha, beta, V32, alpha32, iterations)
+
+    return (V, np.diag(eigvals), k, verify(TridiagonalMatrix(alpha, beta), V, eigvals, probes=probes))
+
+
+# ============================================= #
+# Tarefas                                       #
+# ============================================= #
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """
+    Normaliza as colunas de uma matriz in-place por meio da  
+    norma Euclidiana para um vetor do R^n.
+
+    Args:
+        matrix (np.ndarray): matriz a ter suas colunas normalizadas.
+
+    Returns:
+        np.ndarray: matriz com as colunas normalizadas.
+    """
+
+    norm = np.sqrt(np.sum(matrix**2, axis=0))
+    matrix = matrix / norm
+
+    return matrix
+
+
+def gen_eign(n: int) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Gera autovalores e autovetores (analitacamente conhecidos) para uma 
+    matriz tridiagonal simétrica cujos elementos da diagonal principal são 
+    todos iguais a 2 e das diagonais abaixo e acima dessa são iguais a -1.
+
+    Args:
+        n (int): dimensão da matriz tridiagonal simétrica.
+
+    Returns:
+        tuple: uma matriz cujas colunas são os autovetores (primeira posição) e
+        o vetor dos respectivos autovalores associados (segunda posição).
+    """
+
+    # Ângulos j*pi/(n+1), para j de 1 até n
+    theta = np.arange(1, n+1, 1) * np.pi/(n+1)
+
+    # Gera autovalores e autovetores de uma só vez: v_j[i] = sin(i * theta_j)
+    eigs_vals = 2 * (1 - np.cos(theta))
+    eign_vecs = normalize(np.sin(np.outer(np.arange(1, n+1, 1), theta)))
+
+    return (eign_vecs, eigs_vals)
+
+
+def gen_tridiagonal(alpha, beta, n=None) -> TridiagonalMatrix:
+    """
+    Gera uma matriz tridiagonal simétrica compacta (somente as diagonais são armazenadas;
+    a forma densa pode ser obtida explicitamente por meio de .to_dense()).
+    
+    Se alpha e beta forem listas (ou vetores), os utiliza como diagonal principal (alpha)
+    e diagonais acima e abaixo dessa (beta).
+
+    Se alpha e beta forem números, cria uma matriz com dimensão n em que os 
+    elementos da diagonal princpal são iguais a alpha e os da diagonais axima
+    e abaixo dessa são iguais a beta. 
+
+    Args:
+        alpha (int/float/list/np.ndarray): elemento(s) da diagonal principal.
+        beta (int/float/list/np.ndarray): elemento(s) das diagonais abaixo e acima da principal.
+        n (int/None): se int, n é a dimensão da matriz; se None, a dimensão deve
+                          estar implícita em alpha e beta.
+
+    Returns:
+        TridiagonalMatrix: matriz tridiagonal simétrica.
+    """
+
+    if isinstance(alpha, (float, int)):
+        assert isinstance(beta, (float, int))
+        assert n is not None
+
+        M = TridiagonalMatrix.constant(alpha, beta, n)
+
+    elif isinstance(alpha, (list, np.ndarray)):
+        assert len(alpha) == len(beta)+1
+        assert n is None
+
+        M = TridiagonalMatrix(alpha, beta)
+
+    return M
+
+
+# ============================================= #
+# Verificação                                   #
+# ============================================= #
+
+def residuals(A0: "np.ndarray | TridiagonalMatrix", V: np.ndarray, eigvals: np.ndarray) -> np.ndarray:
+    """
+    Calcula os resíduos ||A v - lambda v|| (norma Euclidiana) de cada autopar. Com a matriz
+    compacta, cada produto custa O(n), sem jamais formar a matriz densa.
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica.
+        V (np.ndarray): matriz cujas colunas são os autovetores.
+        eigvals (np.ndarray): autovalores associados às colunas de V.
+
+    Returns:
+        np.ndarray: resíduo de cada autopar.
+    """
+
+    if not isinstance(A0, TridiagonalMatrix):
+        A0 = TridiagonalMatrix(*tridiagonal_vectors(A0))
+
+    return np.linalg.norm(A0 @ V - V * eigvals, axis=0)
+
+
+def orthogonality_error(V: np.ndarray, probes: int=8, seed: int=0) -> float:
+    """
+    Estima ||V^T V - I|| (norma 2) por meio de vetores de prova aleatórios: para cada prova x
+    unitária, ||V^T (V x) - x|| é um limitante inferior da norma, obtido em O(n^2). O erro
+    na norma de cada coluna, também O(n^2), é incluído. Se probes >= n, o cálculo é exato.
+
+    Args:
+        V (np.ndarray): matriz cujas colunas deveriam ser ortonormais.
+        probes (int): número de vetores de prova.
+        seed (int): semente do gerador aleatório, para resultados reprodutíveis.
+
+    Returns:
+        float: estimativa do erro de ortogonalidade.
+    """
+
+    m = V.shape[1]
+
+    if probes >= m:
+        return float(np.linalg.norm(V.T @ V - np.eye(m), 2))
+
+    X = np.random.default_rng(seed).standard_normal((m, probes))
+    X = X / np.linalg.norm(X, axis=0)
+
+    probe_error = np.max(np.linalg.norm(V.T @ (V @ X) - X, axis=0))
+    norm_error = np.max(np.abs(np.sum(V**2, axis=0) - 1))
+
+    return float(max(probe_error, norm_error))
+
+
+def align_eigenpairs(V: np.ndarray, eigvals: np.ndarray, V_ref: np.ndarray, eigvals_ref: np.ndarray) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Ordena os autopares obtidos como os de referência (pelos autovalores) e ajusta o sinal
+    de cada autovetor ao do respectivo autovetor de referência, em O(n^2).
+
+    Args:
+        V (np.ndarray/None): autovetores obtidos (colunas); se None, somente ordena os autovalores.
+        eigvals (np.ndarray): autovalores obtidos.
+        V_ref (np.ndarray): autovetores de referência (colunas).
+        eigvals_ref (np.ndarray): autovalores de referência.
+
+    Returns:
+        tuple: autovetores (primeira posição) e autovalores (segunda posição) alinhados.
+    """
+
+    # Permutação que leva a ordem obtida à ordem de referência
+    order = np.argsort(eigvals)[np.argsort(np.argsort(eigvals_ref))]
+    eigvals = np.asarray(eigvals)[order]
+
+    if V is not None:
+        V = V[:, order]
+        V = V * np.where(np.sum(V * V_ref, axis=0) < 0, -1.0, 1.0)
+
+    return (V, eigvals)
+
+
+def verify(A0: "np.ndarray | TridiagonalMatrix", V: np.ndarray, eigvals: np.ndarray,
+           expected: "tuple[np.ndarray, np.ndarray]"=None, probes: int=8) -> dict:
+    """
+    Verifica uma decomposição espectral com custo O(n^2), muito menor que o da própria
+    decomposição: resíduos, erro de ortogonalidade e, se houver referência, erros dos
+    autovalores e autovetores após o alinhamento de ordem e sinal.
+
+    Args:
+        A0 (np.ndarray/TridiagonalMatrix): matriz tridiagonal simétrica decomposta.
+        V (np.ndarray/None): autovetores obtidos (colunas); se None, somente os autovalores são verificados.
+        eigvals (np.ndarray): autovalores obtidos.
+        expected (tuple/None): autovetores e autovalores de referência, como em gen_eign.
+        probes (int): número de vetores de prova para o erro de ortogonalidade.
+
+    Returns:
+        dict: máximo resíduo ('residual'), erro de ortogonalidade ('orthogonality'), máximo erro
+        dos autovalores ('eigenvalue_error') e dos autovetores ('eigenvector_error'), se calculáveis.
+    """
+
+    eigvals = np.asarray(eigvals, dtype=float)
+    report = {}
+
+    if V is not None:
+        report['residual'] = float(np.max(residuals(A0, V, eigvals)))
+        report['orthogonality'] = orthogonality_error(V, probes)
+
+    if expected is not None:
+        V_ref, eigvals_ref = expected
+        V, eigvals = align_eigenpairs(V, eigvals, V_ref, np.asarray(eigvals_ref))
+
+        report['eigenvalue_error'] = float(np.max(np.abs(eigvals - eigvals_ref)))
+        if V is not None:
+            report['eigenvector_error'] = float(np.max(np.abs(V - V_ref)))
+
+    return report
 
 
 # ============================================= #
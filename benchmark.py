@@ -0,0 +1,366 @@
+# ============================================ #
+# Módulo de benchmark do algoritmo QR e das    #
+#   simulações, com comparação a uma base      #
+# ============================================ #
+
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+
+import numpy as np
+
+import taskBC
+from EPLib import QR, TridiagonalMatrix, mixed_precision_QR, decomposition_cache, givens_rotation, gen_tridiagonal, print_table, ctext
+
+
+# ======================= #
+# Medições e referências  #
+# ======================= #
+
+def measure(func, repeat, budget=1.0):
+    """
+    Mede a mediana dos tempos de execução de uma função dentre várias repetições e o pico de
+    memória alocada (pelo NumPy e pelo Python) numa execução adicional. Casos rápidos são
+    repetidos além de repeat até somarem budget segundos, de modo que a mediana não dependa
+    de poucas amostras (o menor tempo, ao contrário, acompanha as raras execuções rápidas).
+
+    Args:
+        func (callable): função sem argumentos a ser medida.
+        repeat (int): número mínimo de repetições cronometradas.
+        budget (float): tempo total mínimo, em segundos, das repetições cronometradas.
+
+    Returns:
+        tuple: retorno da função (primeira posição), mediana dos tempos em segundos (segunda
+        posição) e pico de memória em bytes (terceira posição).
+    """
+
+    times = []
+    while len(times) < repeat or sum(times) < budget:
+        start = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (output, float(np.median(times)), peak)
+
+
+def accuracy(A, V, Lambda):
+    """
+    Compara uma decomposição espectral com a obtida por np.linalg.eigh (oráculo).
+
+    Args:
+        A (np.ndarray): matriz simétrica decomposta.
+        V (np.ndarray): matriz de autovetores obtida.
+        Lambda (np.ndarray): matriz diagonal de autovalores obtida.
+
+    Returns:
+        dict: resíduo max|A @ V - V @ Lambda| / max|A|, erro de ortogonalidade max|V.T @ V - I|
+        e máximo erro dos autovalores (ordenados) relativo a max|A|.
+    """
+
+    n = A.shape[0]
+    eigvals = np.diag(Lambda)
+    scale = np.max(np.abs(A))
+
+    reference = np.linalg.eigh(A)[0]
+
+    return {
+        'residual' : float(np.max(np.abs(A @ V - V * eigvals)) / scale),
+        'orthogonality' : float(np.max(np.abs(V.T @ V - np.eye(n)))),
+        'eigenvalue_error' : float(np.max(np.abs(np.sort(eigvals) - reference)) / scale)
+    }
+
+
+# ============= #
+# Casos de teste #
+# ============= #
+
+def bench_QR(n, shifted, method, epsilon, repeat):
+    A = gen_tridiagonal(alpha=2, beta=-1, n=n)
+
+    (V, Lambda, k), elapsed, peak = measure(lambda: QR(A, epsilon, shifted, method), repeat)
+
+    return dict(time=elapsed, iterations=k, peak_memory=peak, **accuracy(A.to_dense(), V, Lambda))
+
+
+def bench_graded(n, criterion, direction, epsilon, repeat):
+    # Cadeia graduada da tarefa B: constantes elásticas crescentes ao longo das massas
+    A = TridiagonalMatrix.from_springs(taskBC.spring_constants('B', n), 2)
+
+    # O critério relativo compara |beta| a epsilon * sqrt(|alpha_i alpha_j|): com epsilon
+    # dividido pelo maior |alpha|, não é mais frouxo que o absoluto, e as iterações de ambos
+    # são comparadas com resíduos equivalentes
+    if criterion == 'relative':
+        epsilon = epsilon / np.max(np.abs(A.alpha))
+
+    (V, Lambda, k), elapsed, peak = measure(
+        lambda: QR(A, epsilon, True, 'implicit', criterion=criterion, direction=direction), repeat)
+
+    return dict(time=elapsed, iterations=k, iterations_per_eigenvalue=k / n, peak_memory=peak,
+                **accuracy(A.to_dense(), V, Lambda))
+
+
+def bench_mixed(n, repeat):
+    # Mesma cadeia de bench_graded: iterações em float32 e refinamento em float64
+    A = TridiagonalMatrix.from_springs(taskBC.spring_constants('B', n), 2)
+
+    (V, Lambda, k, _), elapsed, peak = measure(lambda: mixed_precision_QR(A), repeat)
+
+    return dict(time=elapsed, iterations=k, iterations_per_eigenvalue=k / n, peak_memory=peak,
+                **accuracy(A.to_dense(), V, Lambda))
+
+
+def bench_givens_rotation(n, repeat):
+    A = gen_tridiagonal(alpha=2, beta=-1, n=n).to_dense()
+
+    (Q, R), elapsed, peak = measure(lambda: givens_rotation(A), repeat)
+
+    return dict(time=elapsed, peak_memory=peak, residual=float(np.max(np.abs(Q @ R - A))),
+                orthogonality=float(np.max(np.abs(Q.T @ Q - np.eye(n)))))
+
+
+def bench_gen_tridiagonal(n, repeat):
+    _, elapsed, peak = measure(lambda: gen_tridiagonal(alpha=2, beta=-1, n=n), repeat)
+
+    return dict(time=elapsed, peak_memory=peak)
+
+
+def bench_simulation(n, epsilon, repeat):
+    X0 = np.reshape(np.linspace(-1.0, 1.0, n), (n, 1))
+
+    def solve():
+        # Cada repetição inclui a decomposição (sem acertos no cache)
+        decomposition_cache.clear()
+        return taskBC.simulate('B', epsilon, True, X0, None)
+
+    (_, X, W, Q, _, _), elapsed, peak = measure(solve, repeat)
+
+    # Compara com a solução obtida pela decomposição de referência
+    A = TridiagonalMatrix.from_springs(taskBC.spring_constants('B', n), 2).to_dense()
+    eigvals, Q_ref = np.linalg.eigh(A)
+    t_range = np.reshape(np.arange(0, 10.01, 0.01), (1, -1))
+    X_ref = Q_ref @ ((Q_ref.T @ X0) * np.cos(np.sqrt(eigvals)[:, None] @ t_range))
+
+    return dict(time=elapsed, peak_memory=peak, residual=float(np.max(np.abs(X - X_ref)) / np.max(np.abs(X0))))
+
+
+def bench_kernel(n, kernel, epsilon, repeat, t_end=100.0, dt=0.01):
+    # Somente a avaliação temporal: decomposição (em cache) fora da medição
+    rng = np.random.default_rng(0)
+    X0 = rng.standard_normal((n, 1))
+    V0 = rng.standard_normal((n, 1))
+    Q, W, _ = taskBC.decompose('B', epsilon, True, X0)
+
+    def evaluate(kernel):
+        return np.concatenate([X for _, X in taskBC.simulate_chunks(Q, W, X0, t_end, dt, V0=V0, kernel=kernel)], axis=1)
+
+    X, elapsed, peak = measure(lambda: evaluate(kernel), repeat)
+
+    # Exatidão em relação à avaliação direta (np.cos e np.sin em todos os instantes)
+    X_ref = evaluate('direct')
+
+    return dict(time=elapsed, peak_memory=peak, residual=float(np.max(np.abs(X - X_ref)) / np.max(np.abs(X_ref))))
+
+
+def calibrate():
+    """
+    Mede a mediana do tempo de uma carga de referência fixa (QR implícito com n = 32). Medida
+    junto a cada caso, permite comparar tempos de execuções distintas numa máquina cuja
+    velocidade varia ao longo do tempo (máquinas virtuais compartilhadas, frequência da CPU).
+
+    Returns:
+        float: tempo da carga de referência em segundos.
+    """
+
+    A = gen_tridiagonal(alpha=2, beta=-1, n=32)
+
+    return measure(lambda: QR(A, 1e-6, True, 'implicit'), 5, budget=0.0)[1]
+
+
+def run_suite(sizes, epsilon, repeat, max_explicit, max_unshifted, only=None):
+    """
+    Executa todos os casos do benchmark para cada dimensão (ou somente os pares (caso, n)
+    do conjunto only).
+
+    Returns:
+        list: lista de dicionários, um por caso e dimensão.
+    """
+
+    results = []
+
+    for n in sizes:
+        cases = []
+
+        for method in ['explicit', 'implicit']:
+            for shifted in [True, False]:
+                if (method == 'explicit' and n > max_explicit) or (not shifted and n > max_unshifted):
+                    continue
+                name = f"QR-{method}-{'shifted' if shifted else 'unshifted'}"
+                cases.append((name, lambda shifted=shifted, method=method: bench_QR(n, shifted, method, epsilon, repeat)))
+
+        for criterion, direction in [('absolute', 'down'), ('absolute', 'auto'), ('relative', 'auto')]:
+            name = f"QR-graded-{criterion}-{direction}"
+            cases.append((name, lambda criterion=criterion, direction=direction: bench_graded(n, criterion, direction, epsilon, repeat)))
+
+        cases.append(('QR-graded-mixed', lambda: bench_mixed(n, repeat)))
+
+        if n <= max_explicit:
+            cases.append(('givens_rotation', lambda: bench_givens_rotation(n, repeat)))
+
+        cases.append(('gen_tridiagonal', lambda: bench_gen_tridiagonal(n, repeat)))
+        cases.append(('taskBC.simulate', lambda: bench_simulation(n, epsilon, repeat)))
+
+        for kernel in ['direct', 'chebyshev']:
+            cases.append((f"kernel-{kernel}", lambda kernel=kernel: bench_kernel(n, kernel, epsilon, repeat)))
+
+        for name, case in cases:
+            if only is not None and (name, n) not in only:
+                continue
+            print(f"Executando {ctext(name, 'y')} com n = {ctext(str(n), 'y')}...     ", end='\r')
+            results.append(dict(case=name, n=n, calibration=calibrate(), **case()))
+
+    print()
+
+    return results
+
+
+# ======================= #
+# Comparação com uma base #
+# ======================= #
+
+def time_limit(entry, base, tolerance, noise):
+    """
+    Calcula o maior tempo aceitável para um caso: o da base multiplicado pelo fator tolerance,
+    mais a margem absoluta noise, que absorve a flutuação dos casos de poucos milissegundos.
+    Se ambos registram a carga de referência (ver calibrate), o tempo da base é reescalado
+    pela razão entre elas.
+    """
+
+    scale = entry['calibration'] / base['calibration'] if 'calibration' in entry and 'calibration' in base else 1.0
+
+    return tolerance * scale * base['time'] + noise
+
+
+def compare(results, baseline, tolerance, noise=5e-3):
+    """
+    Compara os resultados com uma base armazenada. Há regressão se o tempo exceder o limite (ver time_limit),
+    se o número de iterações aumentar ou se algum erro numérico exceder o da base por mais de
+    uma ordem de grandeza.
+
+    Returns:
+        list: descrições das regressões encontradas.
+    """
+
+    reference = {(entry['case'], entry['n']) : entry for entry in baseline['results']}
+    regressions = []
+
+    for entry in results:
+        base = reference.get((entry['case'], entry['n']))
+        if base is None:
+            continue
+
+        label = f"{entry['case']} (n = {entry['n']})"
+
+        limit = time_limit(entry, base, tolerance, noise)
+        if entry['time'] > limit:
+            regressions.append(f"{label}: tempo {entry['time']:.3e} s > limite {limit:.3e} s (base {base['time']:.3e} s)")
+
+        if 'iterations' in base and entry['iterations'] > base['iterations']:
+            regressions.append(f"{label}: iterações {entry['iterations']} > {base['iterations']}")
+
+        for key in ['residual', 'orthogonality', 'eigenvalue_error']:
+            if key in base and entry[key] > max(10 * base[key], 1e-12):
+                regressions.append(f"{label}: {key} {entry[key]:.3e} > 10 x {base[key]:.3e}")
+
+    return regressions
+
+
+# ========= #
+# Execução  #
+# ========= #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do algoritmo QR e da simulação massa-mola.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 16, 32, 64, 128, 256], help='dimensões n das matrizes')
+    parser.add_argument('--epsilon', type=float, default=1e-6, help='precisão para a convergência')
+    parser.add_argument('--repeat', type=int, default=3, help='repetições cronometradas por caso')
+    parser.add_argument('--max-explicit', type=int, default=64, help='maior n para a fatoração explícita')
+    parser.add_argument('--max-unshifted', type=int, default=64, help='maior n para o QR sem deslocamento')
+    parser.add_argument('--output', default='benchmark.json', help='arquivo JSON de saída')
+    parser.add_argument('--baseline', default=None, help='arquivo JSON de uma execução anterior a ser comparada')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='fator de tolerância para o tempo')
+    parser.add_argument('--noise', type=float, default=5e-3, help='margem absoluta (s) para o ruído na medição do tempo')
+    parser.add_argument('--retries', type=int, default=2, help='novas medições dos casos lentos antes de acusar regressão')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.epsilon, args.repeat, args.max_explicit, args.max_unshifted)
+
+    report = {
+        'meta' : {
+            'date' : time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python' : platform.python_version(),
+            'numpy' : np.__version__,
+            'machine' : platform.machine(),
+            'epsilon' : args.epsilon,
+            'repeat' : args.repeat
+        },
+        'results' : results
+    }
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        # Remede os casos lentos, mantendo a medida mais rápida relativamente à carga de
+        # referência: uma regressão real persiste, enquanto uma interferência passageira, não
+        reference = {(entry['case'], entry['n']) : entry for entry in baseline['results']}
+        for _ in range(args.retries):
+            pending = {(entry['case'], entry['n']) for entry in results
+                       if (entry['case'], entry['n']) in reference
+                       and entry['time'] > time_limit(entry, reference[(entry['case'], entry['n'])], args.tolerance, args.noise)}
+            if not pending:
+                break
+
+            retry = run_suite(sorted({n for _, n in pending}), args.epsilon, args.repeat, args.max_explicit,
+                              args.max_unshifted, only=pending)
+            retry = {(entry['case'], entry['n']) : entry for entry in retry}
+            results = [min(entry, retry.get((entry['case'], entry['n']), entry), key=lambda entry: entry['time'] / entry['calibration'])
+                       for entry in results]
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    print_table({
+        'Caso' : [entry['case'] for entry in results],
+        'n' : [entry['n'] for entry in results],
+        'Tempo (s)' : [f"{entry['time']:.2e}" for entry in results],
+        'k' : [entry.get('iterations', '-') for entry in results],
+        'k/n' : [f"{entry['iterations'] / entry['n']:.2f}" if 'iterations' in entry else '-' for entry in results],
+        'Mem. (kB)' : [f"{entry['peak_memory'] / 1024:.1f}" for entry in results],
+        'Resíduo' : [f"{entry['residual']:.1e}" if 'residual' in entry else '-' for entry in results]
+    })
+    print(f"\nResultados salvos em {ctext(args.output, 'g')}.")
+
+    if args.baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.noise)
+
+        if regressions:
+            print(ctext(f"\n{len(regressions)} regressão(ões) em relação a {args.baseline}:", 'r'))
+            for regression in regressions:
+                print(f"- {regression}")
+            return 1
+
+        print(ctext(f"\nSem regressões em relação a {args.baseline}.", 'g'))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
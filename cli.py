@@ -0,0 +1,195 @@
+# ============================================ #
+# Módulo de execução não interativa (em lote)  #
+#   das tarefas, por argumentos ou arquivo     #
+# ============================================ #
+
+import sys
+import json
+import argparse
+
+import numpy as np
+
+import taskA
+import taskBC
+from EPLib import print_table, ctext
+
+
+# ======== #
+# Tarefa A #
+# ======== #
+
+def task_a(args):
+    args.workers = args.workers or None # 0: todos os núcleos disponíveis
+    infos, results, _, checks = taskA.sweep(args.epsilon, args.n, args.eigvals_only, args.workers)
+
+    print_table(infos)
+
+    report = {
+        'epsilon' : args.epsilon,
+        'results' : [
+            {
+                'test' : int(infos['Teste'][i]),
+                'shifted' : infos['Desloc.'][i],
+                'n' : infos['n'][i],
+                'k' : infos['k'][i],
+                'eigenvalues' : np.asarray(results[i][1]).tolist(),
+                **checks[i]
+            }
+            for i in range(len(results))
+        ]
+    }
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    print(f"\nResultados salvos em {ctext(args.output, 'g')}.")
+
+    if args.plot is not None:
+        taskA.plot(args.n, infos['k'], args.plot)
+        print(f"Gráfico salvo em {ctext(args.plot, 'g')}.")
+
+    return 0
+
+
+# ============= #
+# Tarefas B e C #
+# ============= #
+
+def load_matrix(values, path):
+    """
+    Obtém uma matriz de condições iniciais, de formato (n, m), a partir de uma lista de
+    valores (uma única condição) ou de um arquivo .npy ou texto (uma condição por coluna).
+
+    Returns:
+        np.ndarray/None: matriz de formato (n, m) ou None se nada foi passado.
+    """
+
+    if values is not None:
+        return np.reshape(np.array(values, dtype=float), (len(values), 1))
+
+    if path is not None:
+        matrix = np.load(path) if path.endswith('.npy') else np.loadtxt(path, ndmin=2)
+        return np.reshape(matrix, (matrix.shape[0], -1)).astype(float)
+
+    return None
+
+
+def task_bc(args):
+    epsilon = max(args.epsilon, np.finfo(float).eps)
+    shifted = not args.no_shift
+
+    X0 = load_matrix(args.x0, args.x0_file)
+    V0 = load_matrix(args.v0, args.v0_file)
+
+    if (X0 is None) == (args.n is None):
+        raise ValueError("Erro: informe os deslocamentos iniciais (--x0 ou --x0-file) ou, exclusivamente, --n.")
+    if V0 is not None and (X0 is None or V0.shape != X0.shape):
+        raise ValueError("Erro: as velocidades iniciais devem ter o mesmo formato dos deslocamentos iniciais.")
+
+    # Sem X0, somente o modo de maior frequência é calculado (o espectro completo não é exibido)
+    if X0 is None:
+        print(f"{ctext('Aviso:', 'y')} o modo de maior frequência é obtido por bissecção e iteração inversa; "
+              f"--epsilon e --no-shift não se aplicam.\n")
+
+    # Várias condições iniciais: uma única decomposição para todas
+    if X0 is not None and X0.shape[1] > 1:
+        t_range, X, W, Q, bound = taskBC.simulate_batch(args.task, epsilon, shifted, X0, V0, args.t_end, args.dt,
+                                                        args.mode_tol, args.top_modes, args.kernel)
+        X_plot = X[0]
+
+    # Saída diretamente em disco, bloco a bloco
+    elif args.memmap is not None:
+        Q, W, X0 = taskBC.decompose(args.task, epsilon, shifted, X0, args.n, selected=True)
+        Q, W, bound = taskBC.truncate_modes(Q, W, X0, V0, args.mode_tol, args.top_modes)
+        t_range, X = taskBC.simulate_to_memmap(args.memmap, Q, W, X0, args.t_end, args.dt, V0=V0, kernel=args.kernel)
+        t_range = np.reshape(t_range, (1, t_range.shape[0]))
+        X_plot = X
+
+    else:
+        t_range, X, W, Q, X0, bound = taskBC.simulate(args.task, epsilon, shifted, X0, args.n, args.t_end, args.dt, V0,
+                                                      args.mode_tol, args.top_modes, args.kernel, selected=True)
+        X_plot = X
+
+    arrays = {'t' : t_range[0], 'W' : W[:, 0], 'Q' : Q, 'X0' : X0, 'bound' : bound}
+    if args.memmap is None or X.ndim == 3:
+        arrays['X'] = X
+    if V0 is not None:
+        arrays['V0'] = V0
+
+    np.savez(args.output, **arrays)
+
+    print(f"{ctext('> Frequências de oscilação:', 'b')}")
+    print(W.T, end='\n\n')
+    if args.mode_tol is not None or args.top_modes is not None:
+        print(f"{ctext('> Modos mantidos:', 'b')} {W.shape[0]} | Limitante do erro de truncamento: {bound:.3e}", end='\n\n')
+    print(f"Resultados salvos em {ctext(args.output, 'g')}.")
+    if args.memmap is not None and X.ndim == 2:
+        print(f"Deslocamentos {X.shape} (float64, ordem de Fortran) salvos em {ctext(args.memmap, 'g')}.")
+
+    if args.plot is not None:
+        taskBC.plot(t_range, X_plot, X0[:, :1], args.plot, args.plot_mode, args.masses)
+        print(f"Gráfico salvo em {ctext(args.plot, 'g')}.")
+
+    return 0
+
+
+# ========= #
+# Execução  #
+# ========= #
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Execução não interativa das tarefas do Exercício-Programa #1.')
+    parser.add_argument('--config', default=None, help='arquivo JSON com valores para os argumentos do subcomando')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_a = subparsers.add_parser('a', help='eficiência do algoritmo QR com e sem deslocamento (tarefa A)')
+    parser_a.add_argument('--epsilon', type=float, default=1e-6, help='precisão para a convergência')
+    parser_a.add_argument('--n', type=int, nargs='+', default=[4, 8, 16, 32], help='dimensões n das matrizes')
+    parser_a.add_argument('--eigvals-only', action='store_true', help='calcula somente os autovalores')
+    parser_a.add_argument('--workers', type=int, default=1, help='número de processos (0 para todos os núcleos)')
+    parser_a.add_argument('--output', default='taskA.json', help='arquivo JSON de saída')
+    parser_a.add_argument('--plot', default=None, help='arquivo de imagem do gráfico (omitido se não passado)')
+    parser_a.set_defaults(func=task_a)
+
+    parser_bc = subparsers.add_parser('bc', help='simulação do sistema massa-mola (tarefas B e C)')
+    parser_bc.add_argument('--task', type=str.upper, choices=['B', 'C'], default='B', help='lei de formação das constantes elásticas')
+    parser_bc.add_argument('--epsilon', type=float, default=1e-6, help='precisão para a convergência')
+    parser_bc.add_argument('--no-shift', action='store_true', help='desabilita os deslocamentos espectrais')
+    parser_bc.add_argument('--x0', type=float, nargs='+', default=None, help='deslocamentos iniciais')
+    parser_bc.add_argument('--x0-file', default=None, help='arquivo .npy ou texto com deslocamentos iniciais (n x m)')
+    parser_bc.add_argument('--v0', type=float, nargs='+', default=None, help='velocidades iniciais')
+    parser_bc.add_argument('--v0-file', default=None, help='arquivo .npy ou texto com velocidades iniciais (n x m)')
+    parser_bc.add_argument('--n', type=int, default=None, help='número de massas (X0 dado pelo modo de maior frequência)')
+    parser_bc.add_argument('--mode-tol', type=float, default=None, help='despreza modos de amplitude relativa abaixo deste valor')
+    parser_bc.add_argument('--top-modes', type=int, default=None, help='mantém somente os modos de maior energia')
+    parser_bc.add_argument('--t-end', type=float, default=10.0, help='instante final da simulação (s)')
+    parser_bc.add_argument('--dt', type=float, default=0.01, help='passo de tempo (s)')
+    parser_bc.add_argument('--kernel', choices=['direct', 'chebyshev'], default='direct', help='avaliação temporal: np.cos direto ou recorrência de Chebyshev')
+    parser_bc.add_argument('--output', default='taskBC.npz', help='arquivo .npz de saída')
+    parser_bc.add_argument('--memmap', default=None, help='arquivo binário para os deslocamentos, escritos bloco a bloco')
+    parser_bc.add_argument('--plot', default=None, help='arquivo de imagem do gráfico (omitido se não passado)')
+    parser_bc.add_argument('--plot-mode', choices=['auto', 'subplots', 'selected', 'heatmap'], default='auto', help='tipo de gráfico')
+    parser_bc.add_argument('--masses', type=int, nargs='+', default=None, help="massas (a partir de 1) exibidas no modo 'selected'")
+    parser_bc.set_defaults(func=task_bc)
+
+    return (parser, {'a' : parser_a, 'bc' : parser_bc})
+
+
+def main(argv=None):
+    parser, subparsers = build_parser()
+    args = parser.parse_args(argv)
+
+    # Valores do arquivo de configuração substituem os padrões, mas não os argumentos explícitos
+    if args.config is not None:
+        with open(args.config) as file:
+            config = json.load(file)
+
+        subparser = subparsers[args.command]
+        subparser.set_defaults(**{key.replace('-', '_') : value for key, value in config.items()})
+        args = parser.parse_args(argv)
+
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,25 +3,278 @@
 #         e tratamento básico de entradas         #
 # =============================================== #
 
+import time
+import asyncio
+import tempfile
+import threading
+import multiprocessing
+
 import taskA
 import taskBC
 import numpy as np
 
-from EPLib import ctext
+from EPLib import decomposition_cache, ctext
+
+
+# ======================== #
+# Tarefas em segundo plano #
+# ======================== #
+
+def job_target(conn, func, args, report_progress, cache_directory=None):
+    """
+    Executa func(*args) num processo filho, enviando pela conexão o progresso (se
+    report_progress, por meio do argumento progress de func) e, ao final, o resultado.
+    As decomposições são lidas e gravadas no cache em disco da sessão, pois o cache em
+    memória do processo filho se perde ao seu término.
+    """
+
+    decomposition_cache.directory = cache_directory
+
+    try:
+        if report_progress:
+            def progress(count, amount, elapsed, eta):
+                conn.send(('progress', count/amount, eta))
+
+            result = func(*args, progress=progress)
+        else:
+            result = func(*args)
+
+        conn.send(('done', result))
+
+    except Exception as error:
+        conn.send(('error', f"{type(error).__name__}: {error}"))
+
+    finally:
+        conn.close()
+
+
+class Job:
+    """
+    Cálculo executado num processo próprio, de modo que o menu continua respondendo e o
+    cálculo pode ser cancelado a qualquer momento (encerrando o processo).
+    """
+
+    def __init__(self, number, description, func, args, viewer, report_progress=False):
+        self.number = number           # Número da tarefa
+        self.description = description # Descrição exibida na lista de tarefas
+        self.viewer = viewer           # Exibe, interativamente, o resultado
+        self.status = 'executando'     # 'executando', 'concluída', 'cancelada' ou 'erro'
+        self.progress = None           # Fração concluída, se informada
+        self.eta = None                # Tempo restante estimado, se informado
+        self.result = None             # Resultado (ou mensagem de erro)
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+        self.conn, child_conn = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(target=job_target, daemon=True,
+                                               args=(child_conn, func, args, report_progress, decomposition_cache.directory))
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def running(self):
+        return self.status == 'executando'
+
+    def poll(self):
+        """
+        Recebe as mensagens pendentes do processo. Retorna True se a tarefa acabou de terminar.
+        """
+
+        if not self.running:
+            return False
+
+        self.elapsed = time.perf_counter() - self.start
+
+        try:
+            while self.conn.poll():
+                message = self.conn.recv()
+
+                if message[0] == 'progress':
+                    self.progress, self.eta = message[1:]
+                    continue
+
+                self.status = 'concluída' if message[0] == 'done' else 'erro'
+                self.result = message[1]
+                self.process.join()
+                self.conn.close()
+                return True
+
+        except EOFError: # Processo encerrado sem enviar o resultado
+            pass
+
+        if not self.process.is_alive() and self.running:
+            self.status = 'erro'
+            self.result = f"Processo encerrado inesperadamente (código {self.process.exitcode})."
+            return True
+
+        return False
+
+    def cancel(self):
+        if self.running:
+            self.process.terminate()
+            self.process.join()
+            self.conn.close()
+            self.status = 'cancelada'
+
+    def __str__(self):
+        colors = {'executando' : 'y', 'concluída' : 'g', 'cancelada' : 'r', 'erro' : 'r'}
+        line = f"#{self.number} [{ctext(self.status, colors[self.status])}] {self.description} ({self.elapsed:.1f} s"
+
+        if self.running and self.progress is not None:
+            line += f", {self.progress * 100:.0f}%, ETA: {self.eta:.1f} s"
+
+        return line + ')'
+
+
+async def ainput(prompt=''):
+    """
+    Versão assíncrona de input: a leitura ocorre numa thread (daemon), mantendo o laço de
+    eventos livre para acompanhar as tarefas em segundo plano.
+    """
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def read():
+        try:
+            value = input(prompt)
+            loop.call_soon_threadsafe(future.set_result, value)
+        except BaseException as error:
+            loop.call_soon_threadsafe(future.set_exception, error)
+
+    threading.Thread(target=read, daemon=True).start()
+
+    return await future
+
+
+async def monitor(jobs):
+    """
+    Acompanha periodicamente as tarefas em segundo plano, avisando quando terminam.
+    """
+
+    while True:
+        for job in jobs:
+            if job.poll():
+                print(f"\n{ctext(f'> Tarefa #{job.number} {job.status}:', 'g' if job.status == 'concluída' else 'r')} "
+                      f"{job.description}. Veja em {ctext('3)', 'b')} no menu principal.")
+
+        await asyncio.sleep(0.2)
+
+
+def submit(jobs, description, func, args, viewer, report_progress=False):
+    job = Job(len(jobs) + 1, description, func, args, viewer, report_progress)
+    jobs.append(job)
+
+    print(f"\n{ctext(f'Tarefa #{job.number} iniciada em segundo plano:', 'g')} {description}.")
+    print(f"Acompanhe, visualize ou cancele em {ctext('3)', 'b')} no menu principal.\n")
+
+    return job
+
+
+def submit_sweep(jobs, epsilon, n_vals):
+    description = f"Tarefa A, n = {n_vals}, epsilon = {epsilon}"
+    viewer = lambda result: taskA.show(n_vals, *result[:3])
+
+    return submit(jobs, description, taskA.sweep, (epsilon, n_vals), viewer, report_progress=True)
+
+
+def submit_simulation(jobs, task, epsilon, shifted, X0, n):
+    initial = f"X0 = {X0.T[0].tolist()}" if X0 is not None else f"n = {n}, X0 do modo de maior frequência"
+    description = f"Tarefa {task.upper()}, {initial}"
+    viewer = lambda result: taskBC.show(*result)
+
+    return submit(jobs, description, taskBC.simulate, (task, epsilon, shifted, X0, n), viewer)
+
+
+async def jobs_menu(jobs):
+    """
+    Lista as tarefas em segundo plano, permitindo visualizar resultados e cancelar tarefas.
+    """
+
+    while True:
+        for job in jobs:
+            job.poll()
+
+        print(f"\n{ctext('> Tarefas em segundo plano:', 'b')}")
+        if not jobs:
+            print('Nenhuma tarefa foi iniciada.')
+            return
+
+        for job in jobs:
+            print(job)
+
+        num = await ainput(f"\nEntre com o {ctext('número de uma tarefa', 'y')}, {ctext('Enter', 'g')} para atualizar ou {ctext('voltar', 'r')}: ")
+
+        if num.lower() == 'voltar':
+            return
+        elif num == '':
+            continue
+        elif not num.isdigit() or not 1 <= int(num) <= len(jobs):
+            print(ctext('Entrada inválida.', 'r'))
+            continue
+
+        job = jobs[int(num) - 1]
+        job.poll()
+
+        if job.status == 'concluída':
+            job.viewer(job.result) # Exibição interativa no processo principal
+
+        elif job.running:
+            cancel = await ainput(f"Tarefa #{job.number} em execução. Cancelá-la? ({ctext('s', 'r')}/[{ctext('n', 'g')}]): ") or 'n'
+            if cancel.lower() == 's':
+                job.cancel()
+                print(ctext(f'Tarefa #{job.number} cancelada.', 'r'))
+
+        elif job.status == 'erro':
+            print(ctext(job.result, 'r'))
+
+        else:
+            print(f"Tarefa #{job.number} {job.status}.")
 
 
 def start():
+    # Cada cálculo roda num processo próprio: as decomposições são compartilhadas entre eles
+    # por um cache em disco, removido ao fim da sessão
+    with tempfile.TemporaryDirectory(prefix='numerico-ep1-') as directory:
+        decomposition_cache.directory = directory
+        asyncio.run(main())
+
+    decomposition_cache.directory = None
+
+    return
+
+
+async def main():
+    jobs = [] # Tarefas iniciadas em segundo plano
+    watcher = asyncio.create_task(monitor(jobs))
+
+    try:
+        await menu(jobs)
+    finally:
+        watcher.cancel()
+
+        # Encerra as tarefas ainda em execução
+        for job in jobs:
+            job.cancel()
+
+    return
+
+
+async def menu(jobs):
     
     # ==================== #
     # Execução do programa #
     # ==================== #
 
     while True:
+        running = sum(job.running for job in jobs)
+
         print(f"Escolha uma tarefa abaixo ou digite {ctext('sair', 'r')} para finalizar a execução.\n")
         print(f"{ctext('1)', 'b')} Eficiência do algoritmo QR com e sem deslocamento espectral.")
-        print(f"{ctext('2)', 'b')} Simulação de um sistema massa-mola.\n")
+        print(f"{ctext('2)', 'b')} Simulação de um sistema massa-mola.")
+        print(f"{ctext('3)', 'b')} Tarefas em segundo plano ({running} em execução, {len(jobs) - running} finalizada(s)).\n")
 
-        task = input(f"Entre com {ctext('1', 'b')}, {ctext('2', 'b')} ou {ctext('sair', 'r')}: ")
+        task = await ainput(f"Entre com {ctext('1', 'b')}, {ctext('2', 'b')}, {ctext('3', 'b')} ou {ctext('sair', 'r')}: ")
 
         # ================= #
         # Executar tarefa A #
@@ -33,7 +286,7 @@ def start():
                 print(f"\n{ctext('1)', 'm')} Executar o caso definido na tarefa A do enunciado.")
                 print(f"{ctext('2)', 'm')} Customizar um caso próprio.")
 
-                A_opt = input(f"\nEntre com {ctext('1', 'm')}, {ctext('2', 'm')} ou {ctext('voltar', 'r')}: ")
+                A_opt = await ainput(f"\nEntre com {ctext('1', 'm')}, {ctext('2', 'm')} ou {ctext('voltar', 'r')}: ")
                 print()
 
                  # Executar a tarefa A como no enunciado
@@ -41,16 +294,16 @@ def start():
                     epsilon = 1e-6
                     n_vals = [4, 8, 16, 32]
                 
-                    taskA.run(epsilon, n_vals)
+                    submit_sweep(jobs, epsilon, n_vals)
                     break
 
                 # Customizar a tarefa A
                 elif A_opt == '2': 
-                    epsilon = float(input(f"Entre com o valor de {ctext('epsilon', 'y')}: "))
-                    n_vals = input(f"Entre com os valores de {ctext('n', 'y')} separados por espaço: ")
+                    epsilon = float(await ainput(f"Entre com o valor de {ctext('epsilon', 'y')}: "))
+                    n_vals = await ainput(f"Entre com os valores de {ctext('n', 'y')} separados por espaço: ")
                     n_vals = [int(n) for n in n_vals.split(' ')]
 
-                    taskA.run(epsilon, n_vals)
+                    submit_sweep(jobs, epsilon, n_vals)
                     break
                 
                 ### Retroceder ###
@@ -69,7 +322,7 @@ def start():
 
             # Escolha dos parâmtros gerais (deslocamento)
             while True:
-                enable_shift = input(f"\nHabilitar deslocamentos espectrais no algoritmo QR? ([{ctext('s', 'g')}]/{ctext('n', 'r')}): ") or 's'
+                enable_shift = await ainput(f"\nHabilitar deslocamentos espectrais no algoritmo QR? ([{ctext('s', 'g')}]/{ctext('n', 'r')}): ") or 's'
 
                 if enable_shift.lower() == 's':
                     shifted = True
@@ -81,7 +334,7 @@ def start():
                     print(ctext('Entrada inválida.', 'r'))
 
             # Escolha dos parâmtros gerais (precisão)
-            epsilon = float(input(f"Entre com a precisão para a convergência (pressione {ctext('Enter', 'g')} para utilizar {ctext('epsilon = 1e-6', 'g')}): ") or '1e-6')
+            epsilon = float(await ainput(f"Entre com a precisão para a convergência (pressione {ctext('Enter', 'g')} para utilizar {ctext('epsilon = 1e-6', 'g')}): ") or '1e-6')
 
             if epsilon < np.finfo(float).eps:
                 print(ctext(f"AVISO: Impossível garantir precisão de {epsilon}, será utilizada a precisão de máquina: {np.finfo(float).eps}", 'r'))
@@ -94,7 +347,7 @@ def start():
                 print(f"{ctext('2)', 'm')} Executar o caso definido na tarefa C do enunciado.")
                 print(f"{ctext('3)', 'm')} Customizar um caso próprio.")
 
-                BC_opt = input(f"\nEntre com {ctext('1', 'm')}, {ctext('2', 'm')}, {ctext('3', 'm')} ou {ctext('voltar', 'r')}: ")
+                BC_opt = await ainput(f"\nEntre com {ctext('1', 'm')}, {ctext('2', 'm')}, {ctext('3', 'm')} ou {ctext('voltar', 'r')}: ")
                 print()
 
                 # ================= #
@@ -107,14 +360,14 @@ def start():
                     print(f"{ctext('2)', 'g')} X0 = [ 1, 10, -4,  3, -2]")
                     print(f"{ctext('3)', 'g')} X0 correspondente ao modo de maior frequência")
 
-                    B_X0_opt = input(f"\nEntre com {ctext('1', 'g')}, {ctext('2', 'g')} ou {ctext('3', 'g')}: ")
+                    B_X0_opt = await ainput(f"\nEntre com {ctext('1', 'g')}, {ctext('2', 'g')} ou {ctext('3', 'g')}: ")
                     
                     # Executar tarefa B com primeiro X0
                     if B_X0_opt == '1':
                         X0 = np.array([-2, -3, -1, -3, -1])
                         X0 = np.reshape(X0, (X0.shape[0], 1))
 
-                        taskBC.run('B', epsilon, shifted, X0, None)
+                        submit_simulation(jobs, 'B', epsilon, shifted, X0, None)
                         break
 
                     # Executar tarefa B com segundo X0
@@ -122,14 +375,14 @@ def start():
                         X0 = np.array([1, 10, -4, 3, -2])
                         X0 = np.reshape(X0, (X0.shape[0], 1))
 
-                        taskBC.run('B', epsilon, shifted, X0, None)
+                        submit_simulation(jobs, 'B', epsilon, shifted, X0, None)
                         break
                     
                     # Executar tarefa B com terceiro X0
                     elif B_X0_opt == '3': 
                         n = 5
 
-                        taskBC.run('B', epsilon, shifted, None, n)
+                        submit_simulation(jobs, 'B', epsilon, shifted, None, n)
                         break
 
                     # Usuário não escolheu um X0 na tarefa B
@@ -146,14 +399,14 @@ def start():
                     print(f"{ctext('2)', 'g')} X0 = [ 1, 10, -4,  3, -2,  1, 10, -4,  3, -2]")
                     print(f"{ctext('3)', 'g')} X0 correspondente ao modo de maior frequência")
 
-                    C_X0_opt = input(f"\nEntre com {ctext('1', 'g')}, {ctext('2', 'g')} ou {ctext('3', 'g')}: ")
+                    C_X0_opt = await ainput(f"\nEntre com {ctext('1', 'g')}, {ctext('2', 'g')} ou {ctext('3', 'g')}: ")
 
                     # Executar tarefa C com primeiro X0
                     if C_X0_opt == '1':
                         X0 = np.array([-2, -3, -1, -3, -1, -2, -3, -1, -3, -1])
                         X0 = np.reshape(X0, (X0.shape[0], 1))
 
-                        taskBC.run('C', epsilon, shifted, X0, None)
+                        submit_simulation(jobs, 'C', epsilon, shifted, X0, None)
                         break
 
                     # Executar tarefa C com segundo X0
@@ -161,14 +414,14 @@ def start():
                         X0 = np.array([ 1, 10, -4,  3, -2,  1, 10, -4,  3, -2])
                         X0 = np.reshape(X0, (X0.shape[0], 1))
 
-                        taskBC.run('C', epsilon, shifted, X0, None)
+                        submit_simulation(jobs, 'C', epsilon, shifted, X0, None)
                         break
 
                     # Executar tarefa C com terceiro X0
                     elif C_X0_opt == '3': 
                         n = 10
 
-                        taskBC.run('C', epsilon, shifted, None, n)
+                        submit_simulation(jobs, 'C', epsilon, shifted, None, n)
                         break
                     
                     # Usuário não escolheu um X0 na tarefa C
@@ -187,11 +440,11 @@ def start():
                         print(f"{ctext('1)', 'g')} Digitar os valores do deslocamento inicial (elementos de X0).")
                         print(f"{ctext('2)', 'g')} Entrar apenas com a dimensão do vetor X0 (n).")
 
-                        BC_main_param_opt = input(f"\nEntre com {ctext('1', 'g')} ou {ctext('2', 'g')}: ")
+                        BC_main_param_opt = await ainput(f"\nEntre com {ctext('1', 'g')} ou {ctext('2', 'g')}: ")
 
                         # Entrar com os valores de X0
                         if BC_main_param_opt == '1':
-                            X0 = input(f"\nEntre com os valores do vetor {ctext('X0', 'y')} separados por espaço: ")
+                            X0 = await ainput(f"\nEntre com os valores do vetor {ctext('X0', 'y')} separados por espaço: ")
                             X0 = np.array([float(x) for x in X0.split(' ')])
                             X0 = np.reshape(X0, (X0.shape[0], 1))
                             n = None
@@ -199,7 +452,7 @@ def start():
                         
                         # Entrar com a dimensão do vetor X0
                         elif BC_main_param_opt == '2':
-                            n = int(input(f"\nEntre com a dimensão {ctext('n', 'y')} do vetor: "))
+                            n = int(await ainput(f"\nEntre com a dimensão {ctext('n', 'y')} do vetor: "))
                             X0 = None
                             print('Será utilizado como X0 o modo de vibração associado a maior frequência.')
                             break
@@ -211,7 +464,7 @@ def start():
                     # Escolher qual deve ser a lei de formação para k
                     while True:
                         print(f"\nA constante elástica das molas deve ser definida como na tarefa {ctext('B', 'y')} ou como na tarefa {ctext('C', 'y')}? ")
-                        k_type = input(f"Entre com {ctext('B', 'y')} ou {ctext('C', 'y')} (case insensitive): ")
+                        k_type = await ainput(f"Entre com {ctext('B', 'y')} ou {ctext('C', 'y')} (case insensitive): ")
 
                         # Usuário não escolheu uma entrada válida
                         if k_type.lower() != 'b' and k_type.lower() != 'c':
@@ -220,7 +473,7 @@ def start():
                         else:
                             break
 
-                    taskBC.run(k_type, epsilon, shifted, X0, n)
+                    submit_simulation(jobs, k_type, epsilon, shifted, X0, n)
                     break
 
                 ### Retroceder ###
@@ -231,8 +484,18 @@ def start():
                 else:
                     print(ctext('Entrada inválida.', 'r'))
         
+        # ======================== #
+        # Tarefas em segundo plano #
+        # ======================== #
+
+        elif task == '3':
+            await jobs_menu(jobs)
+            print()
+
         ### Sair ###
         elif task.lower() == 'sair': # Finalizar o programa
+            if any(job.running for job in jobs):
+                print(ctext('As tarefas em execução serão canceladas.', 'r'))
             break
         
         ### Erro ###
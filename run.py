@@ -3,10 +3,18 @@
 #    Exercío-Promgrama    #
 # ======================= #
 
-import interface
+import sys
 
 
-print(
+if __name__ == '__main__':
+    # Com argumentos, executa em lote (sem interação com o usuário)
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.main())
+
+    import interface
+
+    print(
 """\033[32m
 ===================================================
                 Exercício-Programa #1
@@ -19,8 +27,8 @@ MAP3121 – Métodos Numéricos e Aplicações
 
 ===================================================
 \033[0m"""
-)
+    )
 
-interface.start()
+    interface.start()
 
-print('\n\033[31mExecução finalizada.\033[0m')
+    print('\n\033[31mExecução finalizada.\033[0m')
@@ -2,53 +2,180 @@
 # Módulo de execução da tarefa A #
 # ============================== #
 
+import time
+
 import numpy as np
-import matplotlib.pyplot as plt
 
-from EPLib import QR, gen_tridiagonal, gen_eign, print_table, ctext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from EPLib import cached_QR, QR_eigenvalues, gen_tridiagonal, gen_eign, verify, print_table, ctext
 
 
 # ================ #
 # Executa a tarefa #
 # ================ #
 
-def run(epsilon, n_vals):
-    amount = len(n_vals) # Quantidade de execuções únicas
-    count = 0            # Conta a execução atual
+def solve_case(epsilon, n, shifted, eigvals_only=False):
+    """
+    Executa o algoritmo QR para a matriz da tarefa A de dimensão n. Utilizada como tarefa
+    nos processos paralelos de sweep.
+
+    Returns:
+        tuple: autovetores (None se eigvals_only), autovalores e número de iterações.
+    """
+
+    A = gen_tridiagonal(alpha=2, beta=-1, n=n)
+
+    # Somente autovalores: dispensa a acumulação dos autovetores
+    if eigvals_only:
+        Lambda, k = QR_eigenvalues(A, epsilon, shifted)
+        return (None, Lambda, k)
+
+    Q, R, k = cached_QR(A, epsilon, shifted)
+
+    return (Q, np.diag(R), k)
+
+
+def sweep(epsilon, n_vals, eigvals_only=False, workers=1, progress=None):
+    """
+    Executa, sem interação com o usuário, o algoritmo QR com e sem deslocamento espectral
+    para cada dimensão em n_vals.
+
+    Com mais de um processo, as execuções são distribuídas num conjunto de processos (as de
+    maior dimensão primeiro) e recolhidas à medida que terminam; a ordem dos resultados é
+    sempre a mesma da execução sequencial.
+
+    Args:
+        epsilon (float): precisão mínima para a convergência do algoritmo QR.
+        n_vals (list): dimensões das matrizes.
+        eigvals_only (bool): calcula somente os autovalores (True) ou também os autovetores (False).
+        workers (int/None): número de processos; se None, utiliza o número de núcleos disponíveis.
+        progress (callable/None): recebe (concluídas, total, decorrido, ETA) a cada execução
+                                  concluída; se None, o progresso é impresso.
+
+    Returns:
+        tuple: informações das execuções (primeira posição), autovetores e autovalores obtidos
+        (segunda posição), esperados (terceira posição) e verificações (quarta posição, como
+        em EPLib.verify), na ordem das execuções.
+    """
+
+    # Para cada n, executa com e sem deslocamento
+    cases = [(n, shifted) for shifted in [True, False] for n in n_vals]
+    amount = len(cases) # Quantidade de execuções
+    solved = [None] * amount
+
+    start = time.perf_counter()
+
+    def report(count):
+        elapsed = time.perf_counter() - start
+        eta = elapsed / count * (amount - count) # Estimada pela média das execuções concluídas
+
+        if progress is not None:
+            progress(count, amount, elapsed, eta)
+            return
+
+        percent = np.round(count/amount * 100, 2)
+        print(f"Progresso: {percent}% ({count}/{amount}) | Decorrido: {elapsed:.1f} s | ETA: {eta:.1f} s     ", end='\r')
+
+    if workers == 1:
+        for i, (n, shifted) in enumerate(cases):
+            solved[i] = solve_case(epsilon, n, shifted, eigvals_only)
+            report(i + 1)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Maiores dimensões primeiro: reduz o tempo ocioso dos processos ao final
+            order = sorted(range(amount), key=lambda i: -cases[i][0])
+            futures = {executor.submit(solve_case, epsilon, cases[i][0], cases[i][1], eigvals_only) : i for i in order}
+
+            for count, future in enumerate(as_completed(futures), 1):
+                solved[futures[future]] = future.result()
+                report(count)
+
+    if progress is None:
+        print()
 
     results = [] # Armazena resultado das execuções
     valid = []   # Armazena autovalores e autovetores analiticamente corretos
+    checks = []  # Armazena as verificações de cada execução
+    analytic = {} # Autopares analíticos já calculados para cada n
     
     # Armazena demais informações das execuções
     infos = {
         'Teste' : [],   # Número do teste (execução)
         'Desloc.' : [], # Com ou sem deslocamento
         'n' : [],       # Dimensão da matriz
-        'k' : []        # Iterações
+        'k' : [],       # Iterações
+        'Resíduo' : [], # Máximo ||A v - lambda v||
+        'Ortog.' : [],  # Erro de ortogonalidade dos autovetores
+        'Erro λ' : [],  # Máximo erro dos autovalores
+        'Erro v' : []   # Máximo erro dos autovetores (após alinhamento de sinal)
     }
 
-    # Para cada n, executa com e sem deslocamento
-    for shifted in [True, False]:
-        for n in n_vals:
-            A = gen_tridiagonal(alpha=2, beta=-1, n=n)
-            Q, R, k = QR(A, epsilon, shifted)
+    for count, ((n, shifted), (Q, Lambda, k)) in enumerate(zip(cases, solved)):
+        A = gen_tridiagonal(alpha=2, beta=-1, n=n)
 
-            Lambda = np.diag(R)
+        results.append((Q, Lambda))
+        if n not in analytic:
+            analytic[n] = gen_eign(n)
+        valid.append(analytic[n])
 
-            results.append((Q, Lambda))
-            valid.append(gen_eign(n))
+        check = verify(A, Q, Lambda, analytic[n])
+        checks.append(check)
 
-            infos['Teste'].append(str(count))
-            infos['Desloc.'].append(shifted)
-            infos['k'].append(k)
-            infos['n'].append(n)
+        infos['Teste'].append(str(count))
+        infos['Desloc.'].append(shifted)
+        infos['k'].append(k)
+        infos['n'].append(n)
 
-            count += 1
-            progress = np.round(count/(2*amount) * 100, 2)
+        for column, key in [('Resíduo', 'residual'), ('Ortog.', 'orthogonality'),
+                            ('Erro λ', 'eigenvalue_error'), ('Erro v', 'eigenvector_error')]:
+            infos[column].append(f"{check[key]:.1e}" if key in check else '-')
+
+    return (infos, results, valid, checks)
+
+
+def plot(n_vals, k_vals, path=None):
+    """
+    Gera o gráfico de iterações por dimensão da matriz, com e sem deslocamento. O Matplotlib
+    só é importado aqui, quando o gráfico é de fato solicitado.
+
+    Args:
+        n_vals (list): dimensões das matrizes.
+        k_vals (list): iterações, primeiro com e depois sem deslocamento (como em sweep).
+        path (str/None): arquivo onde salvar o gráfico; se None, o exibe numa janela.
+    """
+
+    import matplotlib
+    if path is not None:
+        matplotlib.use('Agg') # Renderização fora da tela
+    import matplotlib.pyplot as plt
+
+    amount = len(n_vals)
+
+    plt.style.use('seaborn' if 'seaborn' in plt.style.available else 'seaborn-v0_8') # Estilo: 'seaborn'
+    plt.plot(n_vals, k_vals[ :amount], marker='o') # Com deslocamento
+    plt.plot(n_vals, k_vals[amount: ], marker='o') # Sem deslocamento
+
+    plt.title('Influência do deslocamento na eficiência do algoritmo')
+    plt.xlabel('Dimensão da matriz (n)')
+    plt.ylabel('Iterações até a convergência (k)')
+    plt.legend(['Com deslocamento', 'Sem deslocamento'])
+
+    if path is None:
+        plt.show()
+    else:
+        plt.savefig(path)
+        plt.close()
+
+    return
+
+
+def show(n_vals, infos, results, valid):
+    """
+    Exibe, interativamente, a tabela, o gráfico e os autopares de cada teste de uma execução
+    de sweep.
+    """
 
-            print(f"Progresso: {progress}%     ", end='\r')
-        
-    print()
     print(f"\n{ctext('Concluído!', 'g')} Comparação dos resultados:\n")
     print_table(infos) # Imprime a tabela de informações
 
@@ -61,15 +188,7 @@ def run(epsilon, n_vals):
         plot_graph = input(f"\nExibir gráfico de iterações por dimensão da matriz? ([{ctext('s', 'g')}]/{ctext('n', 'r')}): ") or 's'
 
         if plot_graph.lower() == 's': # Exibe gráfico
-            plt.style.use('seaborn')  # Estilo: 'seaborn'
-            plt.plot(n_vals, infos['k'][ :amount], marker='o') # Com deslocamento
-            plt.plot(n_vals, infos['k'][amount: ], marker='o') # Sem deslocamento
-
-            plt.title('Influência do deslocamento na eficiência do algoritmo')
-            plt.xlabel('Dimensão da matriz (n)')
-            plt.ylabel('Iterações até a convergência (k)')
-            plt.legend(['Com deslocamento', 'Sem deslocamento'])
-            plt.show()
+            plot(n_vals, infos['k'])
             break
 
         elif plot_graph.lower() == 'n': # Pula exibição do gráfico
@@ -100,7 +219,10 @@ def run(epsilon, n_vals):
 
             print(ctext('> OBTIDOS', 'b'))
             print('Autovalores:\n', results[num][1], end='\n\n')
-            print('Autovetores:\n', results[num][0])
+            if results[num][0] is not None:
+                print('Autovetores:\n', results[num][0])
+            else:
+                print('Autovetores:\n', ctext('Não calculados (somente autovalores).', 'r'))
 
             print(ctext('\n> ESPERADOS', 'b'))
             print('Autovalores:\n', valid[num][1], end='\n\n')
@@ -110,3 +232,10 @@ def run(epsilon, n_vals):
             print(ctext('Entrada inválida.', 'r'))
 
     return
+
+
+def run(epsilon, n_vals, eigvals_only=False, workers=1):
+    infos, results, valid, _ = sweep(epsilon, n_vals, eigvals_only, workers)
+    show(n_vals, infos, results, valid)
+
+    return
@@ -3,60 +3,723 @@
 # =================================== #
 
 import numpy as np
-import matplotlib.pyplot as plt
 
-from EPLib import QR, gen_tridiagonal, ctext
+from EPLib import cached_QR, TridiagonalMatrix, RotationLog, selected_eigenpairs, ctext
 
 
 # ================ #
-# Executa a tarefa #
+# Lei de formação  #
 # ================ #
 
-def run(task, epsilon, shifted, X0=None, n=None):
-    # XOR: somente um desses deve ser None
-    assert (X0 is None) != (n is None)
+def spring_constants(task, n):
+    """
+    Calcula, de forma vetorizada, as n+1 constantes elásticas das molas consoante a tarefa.
+
+    Args:
+        task (str): 'B' ou 'C' (case insensitive).
+        n (int): número de massas do sistema.
+
+    Returns:
+        np.ndarray: constantes elásticas k(i), para i de 1 até n+1.
+    """
+
+    i = np.arange(1, n+2, 1)
 
     # Define lei de formação de k consoante a tarefa
     if task.lower() == 'b':
-        k = lambda i: 40 + 2*i
+        k_vals = 40 + 2*i
     elif task.lower() == 'c':
-        k = lambda i: 40 + 2*(-1)**i
+        k_vals = 40 + 2*(-1)**i
     else:
-        raise ValueError("Erro: `task` deve ser 'B' ou 'C' e não {task} (case insensitive).")
+        raise ValueError(f"Erro: `task` deve ser 'B' ou 'C' e não {task} (case insensitive).")
+
+    return k_vals.astype(float)
+
+
+# ========= #
+# Simulação #
+# ========= #
+
+def decompose(task, epsilon, shifted, X0=None, n=None, accumulate='dense', selected=False, criterion='absolute',
+              direction='down'):
+    """
+    Obtém as frequências e os modos de vibração do sistema massa-mola da tarefa B ou C.
+
+    Args:
+        task (str): 'B' ou 'C' (case insensitive).
+        epsilon (float): precisão mínima para a convergência do algoritmo QR.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        X0 (np.ndarray/None): deslocamentos iniciais, de formato (n, 1); se None, utiliza
+                              o modo de vibração associado à maior frequência.
+        n (int/None): número de massas; deve ser None se, e somente se, X0 for passado.
+        accumulate (str): 'dense' para modos em matriz densa ou 'log' para um EPLib.RotationLog,
+                          que somente multiplica (Q @ Y e Q.T @ Y) e não é indexável; use
+                          truncate_modes para obter, densas, só as colunas mantidas.
+        selected (bool): se X0 for None, obtém somente o modo de maior frequência, por bissecção
+                         e iteração inversa, sem o espectro completo; nesse caso, epsilon e
+                         shifted não se aplicam.
+        criterion (str): critério de deflação, 'absolute' ou 'relative' (ver EPLib.QR); o
+                         relativo com o mesmo epsilon é mais frouxo para constantes elásticas
+                         grandes, de modo que epsilon deve ser reduzido para a mesma precisão.
+        direction (str): 'down', 'up' ou 'auto' (ver EPLib.QR).
+
+    Returns:
+        tuple: modos de vibração Q (primeira posição), frequências W de formato (modos, 1)
+        (segunda posição) e deslocamentos iniciais utilizados (terceira posição).
+    """
+
+    # XOR: somente um desses deve ser None
+    assert (X0 is None) != (n is None)
 
     # Se n não foi passado, determina através do vetor X0
     if n is None:
         n = X0.shape[0]
 
     m = 2 # Massa
-    k_vals = [k(i) for i in range(1, n+2, 1)] # Constante elástica
+    k_vals = spring_constants(task, n) # Constante elástica
 
-    # Cria diagonais da matriz tridiagonal simétrica
-    main_diag = [k_vals[i] + k_vals[i+1] for i in range(len(k_vals)-1)]
-    sub_diag = (-1 * np.array(k_vals[1:-1])).tolist()
+    # Matriz tridiagonal simétrica (compacta) do sistema massa-mola
+    A = TridiagonalMatrix.from_springs(k_vals, m)
 
-    A = 1/m * gen_tridiagonal(main_diag, sub_diag, None)
-    
-    Q, R, _ = QR(A, epsilon=epsilon, shifted=shifted)
+    # Se X0 não foi passado e o espectro completo não é necessário, obtém o modo de máxima
+    # frequência calculando somente o maior autovalor e seu autovetor (bissecção e iteração inversa)
+    if X0 is None and selected:
+        eigval, Q = selected_eigenpairs(A, indices=(n-1, n-1))
+        W = np.sqrt(eigval).reshape((1, 1))
+        X0 = np.copy(Q)
+    else:
+        # Com accumulate='log', o registro de rotações não é armazenado no cache (ver cached_QR)
+        Q, R, _ = cached_QR(A, epsilon=epsilon, shifted=shifted, method='implicit',
+                            criterion=criterion, direction=direction, accumulate=accumulate)
+
+        # Obtém frequências através dos autovalores
+        W = np.sqrt(np.diag(R)).reshape((n, 1))
+
+        # Se X0 não foi passado, obtém seu valor através do modo de máxima frequência
+        # (Q @ e_j, que também vale para um RotationLog, sem indexação de colunas)
+        if X0 is None:
+            e_max = np.zeros((n, 1))
+            e_max[np.argmax(W)] = 1.0
+            X0 = Q @ e_max
+
+    return (Q, W, X0)
+
+
+def time_grid(t_end=10.0, dt=0.01):
+    """
+    Gera os instantes de tempo uniformemente espaçados de 0 até t_end (inclusive).
+
+    Args:
+        t_end (float): instante final da simulação, em segundos.
+        dt (float): passo de tempo, em segundos.
+
+    Returns:
+        np.ndarray: vetor de instantes de tempo.
+    """
+
+    steps = int(round(t_end / dt))
+
+    return np.arange(0, steps+1, 1) * dt
+
+
+def select_modes(Q, W, X0, V0=None, tol=None, top=None):
+    """
+    Seleciona os modos de vibração relevantes para as condições iniciais dadas. A amplitude
+    modal do modo j é a_j = sqrt(y_j(0)^2 + (y_j'(0)/w_j)^2), o máximo de |y_j(t)|; como Q é
+    ortonormal, desprezar um conjunto de modos altera os deslocamentos, em norma 2 e em todo
+    instante, em no máximo sqrt(soma de a_j^2 dos modos desprezados).
+
+    Args:
+        Q (np.ndarray): modos de vibração (colunas).
+        W (np.ndarray): frequências, de formato (modos, 1).
+        X0 (np.ndarray): deslocamentos iniciais, de formato (n, m), um por coluna.
+        V0 (np.ndarray/None): velocidades iniciais, de formato (n, m); se None, nulas.
+        tol (float/None): mantém os modos cuja amplitude, em alguma condição inicial, excede
+                          tol vezes a maior amplitude modal; se None, não filtra por amplitude.
+        top (int/None): mantém, dentre esses, os top modos de maior energia (soma de
+                        w_j^2 a_j^2 sobre as condições iniciais); se None, não limita.
+
+    Returns:
+        tuple: máscara booleana dos modos mantidos (primeira posição) e limitante do erro de
+        truncamento, o maior dentre as condições iniciais (segunda posição).
+    """
+
+    # Amplitudes modais: formato (modos, m)
+    amplitude = np.abs(Q.T @ X0)
+    if V0 is not None:
+        amplitude = np.hypot(amplitude, (Q.T @ V0) / W)
+
+    keep = np.ones(amplitude.shape[0], dtype=bool)
+
+    if tol is not None:
+        keep &= np.max(amplitude, axis=1) > tol * np.max(amplitude, initial=0.0)
+
+    if top is not None and np.count_nonzero(keep) > top:
+        energy = np.where(keep, np.sum((W * amplitude)**2, axis=1), -np.inf)
+        keep[:] = False
+        keep[np.argsort(energy)[::-1][:top]] = True
+
+    bound = float(np.max(np.sqrt(np.sum(amplitude[~keep]**2, axis=0)), initial=0.0))
+
+    return (keep, bound)
+
+
+def truncate_modes(Q, W, X0, V0=None, tol=None, top=None):
+    """
+    Mantém somente os modos de vibração relevantes para as condições iniciais dadas (ver
+    select_modes). Se Q for um RotationLog, as amplitudes são obtidas por Q.T @ X0 e somente
+    as colunas mantidas são geradas, por Q @ I[:, keep], numa matriz densa.
+
+    Returns:
+        tuple: modos mantidos (primeira posição), suas frequências (segunda posição) e limitante
+        do erro de truncamento, o maior dentre as condições iniciais (terceira posição).
+    """
+
+    keep, bound = select_modes(Q, W, X0, V0, tol, top)
+
+    if isinstance(Q, RotationLog):
+        columns = np.flatnonzero(keep)
+        E = np.zeros((Q.shape[0], columns.shape[0]))
+        E[columns, np.arange(columns.shape[0])] = 1.0
+
+        return (Q @ E, W[keep], bound)
+
+    return (Q[:, keep], W[keep], bound)
+
+
+def simulate_batch_chunks(Q, W, X0, V0=None, t_end=10.0, dt=0.01, chunk=256, kernel='direct'):
+    """
+    Gera, numa única passagem vetorizada, as trajetórias de várias condições iniciais em
+    blocos de instantes de tempo consecutivos. Em coordenadas modais, cada trajetória é
+    y(t) = y(0) cos(wt) + (y'(0)/w) sin(wt).
+
+    Com kernel='chebyshev', as funções trigonométricas são avaliadas somente nos dois primeiros
+    instantes de cada bloco; nos demais, a malha uniforme permite obter cada valor pela
+    recorrência y(t + dt) = 2 cos(w dt) y(t) - y(t - dt), com uma multiplicação e uma subtração
+    por amostra. O erro de arredondamento acumulado na recorrência é limitado pela nova
+    avaliação exata (reinicialização) a cada bloco.
+
+    Args:
+        Q (np.ndarray): modos de vibração (colunas).
+        W (np.ndarray): frequências, de formato (modos, 1).
+        X0 (np.ndarray): deslocamentos iniciais, de formato (n, m), um por coluna.
+        V0 (np.ndarray/None): velocidades iniciais, de formato (n, m); se None, nulas.
+        t_end (float): instante final da simulação, em segundos.
+        dt (float): passo de tempo, em segundos.
+        chunk (int): número de instantes de tempo por bloco (e entre reinicializações).
+        kernel (str): 'direct' (np.cos e np.sin em todos os instantes) ou 'chebyshev'.
 
-    # Obtém frequências através dos autovalores
-    W = np.sqrt(np.diag(R)).reshape((n, 1))
+    Yields:
+        tuple: instantes de tempo do bloco (primeira posição) e deslocamentos, de formato
+        (m, n, instantes do bloco) (segunda posição).
+    """
 
-    # Se X0 não foi passado, obtém seu valor através da máxima frequência
-    if X0 is None:
-        max_idx = np.argmax(W) # Índice da máxima frequência
-        X0 = np.reshape(Q[ : , max_idx], (n, 1))
+    if kernel not in ['direct', 'chebyshev']:
+        raise ValueError(f"Erro: `kernel` deve ser 'direct' ou 'chebyshev' e não {kernel}.")
+
+    steps = int(round(t_end / dt)) + 1
+
+    # Projeta todas as condições iniciais de uma só vez: formato (m, modos, 1)
+    Y0 = (Q.T @ X0).T[:, :, None]
+    Ydot0 = None if V0 is None else ((Q.T @ V0) / W).T[:, :, None]
+
+    # Coeficiente da recorrência, de formato (modos,)
+    twocos = 2.0 * np.cos(W[:, 0] * dt)
+
+    for start in range(0, steps, chunk):
+        t_chunk = np.arange(start, min(start + chunk, steps), 1) * dt
+
+        if kernel == 'chebyshev':
+            yield (t_chunk, Q @ chebyshev_chunk(Y0, Ydot0, W, t_chunk, twocos))
+            continue
+
+        phase = W @ t_chunk[None, :]
+
+        # Calcula os valores e reverte a transformação (Q é difundido sobre as m trajetórias)
+        Y = Y0 * np.cos(phase)
+        if Ydot0 is not None:
+            Y += Ydot0 * np.sin(phase)
+
+        yield (t_chunk, Q @ Y)
+
+
+def chebyshev_chunk(Y0, Ydot0, W, t_chunk, twocos):
+    """
+    Coordenadas modais de um bloco de instantes uniformemente espaçados pela recorrência de
+    Chebyshev (ver simulate_batch_chunks), a partir de dois instantes avaliados exatamente.
+
+    Returns:
+        np.ndarray: coordenadas modais, de formato (m, modos, instantes do bloco).
+    """
+
+    seed = t_chunk[None, :2]
+    Y_seed = Y0 * np.cos(W @ seed)
+    if Ydot0 is not None:
+        Y_seed += Ydot0 * np.sin(W @ seed)
+
+    # Cada instante ocupa uma região contígua: formato (instantes, m, modos)
+    Y = np.empty((t_chunk.shape[0],) + Y_seed.shape[:2])
+    Y[:Y_seed.shape[2]] = np.moveaxis(Y_seed, -1, 0)
+
+    for j in range(2, t_chunk.shape[0]):
+        np.multiply(twocos, Y[j-1], out=Y[j])
+        Y[j] -= Y[j-2]
+
+    return np.moveaxis(Y, 0, -1)
+
+
+def simulate_chunks(Q, W, X0, t_end=10.0, dt=0.01, chunk=256, V0=None, kernel='direct'):
+    """
+    Gera os deslocamentos das massas em blocos de instantes de tempo consecutivos, de modo
+    que a memória utilizada é limitada pelo tamanho do bloco e não pela duração da simulação.
+
+    Args:
+        Q (np.ndarray): modos de vibração (colunas).
+        W (np.ndarray): frequências, de formato (modos, 1).
+        X0 (np.ndarray): deslocamentos iniciais, de formato (n, 1).
+        t_end (float): instante final da simulação, em segundos.
+        dt (float): passo de tempo, em segundos.
+        chunk (int): número de instantes de tempo por bloco.
+        V0 (np.ndarray/None): velocidades iniciais, de formato (n, 1); se None, nulas.
+        kernel (str): 'direct' ou 'chebyshev' (ver simulate_batch_chunks).
+
+    Yields:
+        tuple: instantes de tempo do bloco (primeira posição) e deslocamentos, de formato
+        (n, instantes do bloco) (segunda posição).
+    """
+
+    for t_chunk, X_chunk in simulate_batch_chunks(Q, W, X0, V0, t_end, dt, chunk, kernel):
+        yield (t_chunk, X_chunk[0])
+
+
+def simulate_to_memmap(path, Q, W, X0, t_end=10.0, dt=0.01, chunk=256, V0=None, kernel='direct'):
+    """
+    Escreve os deslocamentos das massas num arquivo mapeado em memória (np.memmap), bloco a
+    bloco, permitindo simulações mais longas do que caberiam na memória.
+
+    Args:
+        path (str): caminho do arquivo de saída (float64, ordem de Fortran, formato (n, T)).
+        Q (np.ndarray): modos de vibração (colunas).
+        W (np.ndarray): frequências, de formato (modos, 1).
+        X0 (np.ndarray): deslocamentos iniciais, de formato (n, 1).
+        t_end (float): instante final da simulação, em segundos.
+        dt (float): passo de tempo, em segundos.
+        chunk (int): número de instantes de tempo por bloco.
+        V0 (np.ndarray/None): velocidades iniciais, de formato (n, 1); se None, nulas.
+        kernel (str): 'direct' ou 'chebyshev' (ver simulate_batch_chunks).
+
+    Returns:
+        tuple: instantes de tempo (primeira posição) e deslocamentos mapeados do arquivo,
+        de formato (n, T) (segunda posição).
+    """
+
+    t_range = time_grid(t_end, dt)
+
+    # Ordem de Fortran: cada bloco de instantes ocupa uma região contígua do arquivo
+    X = np.memmap(path, dtype=float, mode='w+', shape=(Q.shape[0], t_range.shape[0]), order='F')
+
+    start = 0
+    for t_chunk, X_chunk in simulate_chunks(Q, W, X0, t_end, dt, chunk, V0, kernel):
+        X[:, start:start + t_chunk.shape[0]] = X_chunk
+        start += t_chunk.shape[0]
+
+    X.flush()
+
+    return (t_range, X)
+
+
+def simulate(task, epsilon, shifted, X0=None, n=None, t_end=10.0, dt=0.01, V0=None, tol=None, top=None,
+             kernel='direct', selected=False, accumulate='dense'):
+    """
+    Simula, sem interação com o usuário, o sistema massa-mola da tarefa B ou C.
+
+    Args:
+        task (str): 'B' ou 'C' (case insensitive).
+        epsilon (float): precisão mínima para a convergência do algoritmo QR.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        X0 (np.ndarray/None): deslocamentos iniciais, de formato (n, 1); se None, utiliza
+                              o modo de vibração associado à maior frequência.
+        n (int/None): número de massas; deve ser None se, e somente se, X0 for passado.
+        t_end (float): instante final da simulação, em segundos.
+        dt (float): passo de tempo, em segundos.
+        V0 (np.ndarray/None): velocidades iniciais, de formato (n, 1); se None, nulas.
+        tol (float/None): amplitude modal relativa abaixo da qual os modos são desprezados.
+        top (int/None): número máximo de modos mantidos, os de maior energia.
+        kernel (str): 'direct' ou 'chebyshev' (ver simulate_batch_chunks).
+        selected (bool): sem X0, calcula somente o modo de maior frequência (ver decompose).
+        accumulate (str): 'dense' ou 'log' (ver decompose); com 'log', somente os modos mantidos
+                          (ver truncate_modes) são formados, o que só compensa para poucos modos.
+
+    Returns:
+        tuple: instantes de tempo (1, T), deslocamentos (n, T), frequências, modos de
+        vibração e deslocamentos iniciais utilizados e limitante do erro de truncamento
+        (ver truncate_modes), nesta ordem.
+    """
+
+    Q, W, X0 = decompose(task, epsilon, shifted, X0, n, accumulate, selected)
+    Q, W, bound = truncate_modes(Q, W, X0, V0, tol, top)
 
     # Gera vetor de tempo
-    t_range = np.arange(0, 10.01, 0.01)  
+    t_range = time_grid(t_end, dt)
+    X = np.empty((Q.shape[0], t_range.shape[0]))
+
+    # Preenche os deslocamentos bloco a bloco, sem temporários de formato (n, T)
+    start = 0
+    for t_chunk, X_chunk in simulate_chunks(Q, W, X0, t_end, dt, V0=V0, kernel=kernel):
+        X[:, start:start + t_chunk.shape[0]] = X_chunk
+        start += t_chunk.shape[0]
+
+    t_range = np.reshape(t_range, (1, t_range.shape[0]))
+
+    return (t_range, X, W, Q, X0, bound)
+
+
+def simulate_batch(task, epsilon, shifted, X0, V0=None, t_end=10.0, dt=0.01, tol=None, top=None, kernel='direct',
+                   accumulate='dense'):
+    """
+    Simula, decompondo a matriz uma única vez, o sistema massa-mola da tarefa B ou C para
+    várias condições iniciais simultaneamente.
+
+    Args:
+        task (str): 'B' ou 'C' (case insensitive).
+        epsilon (float): precisão mínima para a convergência do algoritmo QR.
+        shifted (bool): aplica (True) ou não (False) os deslocamentos espectrais.
+        X0 (np.ndarray): deslocamentos iniciais, de formato (n, m), um por coluna.
+        V0 (np.ndarray/None): velocidades iniciais, de formato (n, m); se None, nulas.
+        t_end (float): instante final da simulação, em segundos.
+        dt (float): passo de tempo, em segundos.
+        tol (float/None): amplitude modal relativa abaixo da qual os modos são desprezados.
+        top (int/None): número máximo de modos mantidos, os de maior energia.
+        kernel (str): 'direct' ou 'chebyshev' (ver simulate_batch_chunks).
+        accumulate (str): 'dense' ou 'log' (ver simulate).
+
+    Returns:
+        tuple: instantes de tempo (1, T), deslocamentos (m, n, T), frequências e modos de
+        vibração mantidos e limitante do erro de truncamento (ver truncate_modes), nesta ordem.
+    """
+
+    assert V0 is None or V0.shape == X0.shape
+
+    Q, W, _ = decompose(task, epsilon, shifted, X0, accumulate=accumulate)
+    Q, W, bound = truncate_modes(Q, W, X0, V0, tol, top)
+
+    t_range = time_grid(t_end, dt)
+    X = np.empty((X0.shape[1], Q.shape[0], t_range.shape[0]))
+
+    start = 0
+    for t_chunk, X_chunk in simulate_batch_chunks(Q, W, X0, V0, t_end, dt, kernel=kernel):
+        X[:, :, start:start + t_chunk.shape[0]] = X_chunk
+        start += t_chunk.shape[0]
+
     t_range = np.reshape(t_range, (1, t_range.shape[0]))
 
-    # Aplica a transformação e calcula os valores
-    Y0 = Q.T @ X0
-    Y = Y0 * np.cos(W @ t_range)
+    return (t_range, X, W, Q, bound)
 
-    # Reverte a transformação 
-    X = Q @ Y
+
+# ====== #
+# Modelo #
+# ====== #
+
+class MassSpringModel:
+    """
+    Sistema massa-mola decomposto uma única vez: guarda as constantes elásticas, a massa, os
+    modos de vibração e as frequências, e responde a consultas de deslocamento, velocidade e
+    energia em instantes arbitrários sem recalculá-los. As condições iniciais são projetadas
+    na base modal uma única vez, por set_state. Todos os atributos são números ou arranjos do
+    NumPy, de modo que o modelo pode ser serializado (pickle) e enviado a outros processos.
+    """
+
+    __slots__ = ('k_vals', 'm', 'Q', 'W', 'basis', 'frequencies', 'a', 'b', 'bound')
+
+    def __init__(self, k_vals, m=2, epsilon=1e-6, shifted=True):
+        self.k_vals = np.array(k_vals, dtype=float)
+        self.m = float(m)
+
+        A = TridiagonalMatrix.from_springs(self.k_vals, self.m)
+        Q, R, _ = cached_QR(A, epsilon=epsilon, shifted=shifted, method='implicit')
+
+        self.Q = np.array(Q)            # Modos de vibração (colunas)
+        self.W = np.sqrt(np.diag(R))    # Frequências, de formato (n,)
+
+        # Estado atual: modos mantidos, suas frequências e coeficientes, de formato (modos, m),
+        # de y(t) = a cos(wt) + b sin(wt)
+        self.basis, self.frequencies = self.Q, self.W
+        self.a = np.zeros((self.Q.shape[1], 1))
+        self.b = np.zeros((self.Q.shape[1], 1))
+        self.bound = 0.0
+
+    @classmethod
+    def from_task(cls, task, n, m=2, epsilon=1e-6, shifted=True):
+        """
+        Gera o modelo de n massas iguais a m com as constantes elásticas da tarefa B ou C.
+        """
+
+        return cls(spring_constants(task, n), m, epsilon, shifted)
+
+    @property
+    def n(self):
+        return self.Q.shape[0]
+
+    def set_state(self, X0, V0=None, tol=None, top=None):
+        """
+        Define as condições iniciais das consultas seguintes, opcionalmente mantendo somente
+        os modos relevantes para elas (ver select_modes).
+
+        Args:
+            X0 (np.ndarray): deslocamentos iniciais, de formato (n, m), um por coluna.
+            V0 (np.ndarray/None): velocidades iniciais, de formato (n, m); se None, nulas.
+            tol (float/None): amplitude modal relativa abaixo da qual os modos são desprezados.
+            top (int/None): número máximo de modos mantidos, os de maior energia.
+
+        Returns:
+            MassSpringModel: o próprio modelo, para encadear consultas.
+        """
+
+        X0 = np.reshape(np.asarray(X0, dtype=float), (self.n, -1))
+        V0 = None if V0 is None else np.reshape(np.asarray(V0, dtype=float), X0.shape)
+
+        keep, self.bound = select_modes(self.Q, self.W[:, None], X0, V0, tol, top)
+
+        self.basis = self.Q[:, keep]
+        self.frequencies = self.W[keep]
+        self.a = self.basis.T @ X0
+        self.b = np.zeros_like(self.a) if V0 is None else (self.basis.T @ V0) / self.frequencies[:, None]
+
+        return self
+
+    def modal(self, t, derivative=False):
+        """
+        Coordenadas modais (ou suas derivadas) nos instantes t, de formato (m, modos, T).
+        """
+
+        phase = self.frequencies[:, None] * np.ravel(t)[None, :]
+        cos, sin = np.cos(phase)[:, None, :], np.sin(phase)[:, None, :]
+
+        if derivative:
+            Y = self.frequencies[:, None, None] * (self.b[:, :, None] * cos - self.a[:, :, None] * sin)
+        else:
+            Y = self.a[:, :, None] * cos + self.b[:, :, None] * sin
+
+        return np.moveaxis(Y, 1, 0)
+
+    def displacement(self, t):
+        """
+        Deslocamentos das massas nos instantes t (escalar ou vetor), de formato (n, T) para
+        uma condição inicial ou (m, n, T) para várias.
+        """
+
+        X = self.basis @ self.modal(t)
+
+        return X[0] if X.shape[0] == 1 else X
+
+    def velocity(self, t):
+        """
+        Velocidades das massas nos instantes t (escalar ou vetor), de formato (n, T) para uma
+        condição inicial ou (m, n, T) para várias.
+        """
+
+        V = self.basis @ self.modal(t, derivative=True)
+
+        return V[0] if V.shape[0] == 1 else V
+
+    def kinetic_energy(self, t):
+        """
+        Energia cinética nos instantes t, de formato (m, T). Como a base modal é ortonormal,
+        é calculada nas coordenadas modais, sem reverter a transformação.
+        """
+
+        return 0.5 * self.m * np.sum(self.modal(t, derivative=True)**2, axis=1)
+
+    def potential_energy(self, t):
+        """
+        Energia potencial elástica nos instantes t, de formato (m, T): x.T K x / 2, com
+        K = m A e A = Q diag(w^2) Q.T.
+        """
+
+        return 0.5 * self.m * np.sum((self.frequencies[:, None] * self.modal(t))**2, axis=1)
+
+    def energy(self):
+        """
+        Energia mecânica total (conservada) de cada condição inicial, de formato (m,).
+        """
+
+        return 0.5 * self.m * np.sum((self.frequencies[:, None] * np.hypot(self.a, self.b))**2, axis=0)
+
+
+# ======== #
+# Gráficos #
+# ======== #
+
+def decimate(t, X, buckets):
+    """
+    Reduz séries temporais por decimação mínimo/máximo: cada intervalo de instantes
+    consecutivos é representado por seus valores extremos, na ordem em que ocorrem, de
+    modo que os picos das oscilações são preservados no gráfico.
+
+    Args:
+        t (np.ndarray): instantes de tempo, de formato (T,).
+        X (np.ndarray): séries, de formato (n, T).
+        buckets (int): número de intervalos (cada um gera dois pontos).
+
+    Returns:
+        tuple: instantes (primeira posição) e valores (segunda posição) decimados, ambos de
+        formato (n, 2*buckets), ou as próprias séries se já forem curtas o bastante.
+    """
+
+    n, T = X.shape
+
+    if T <= 2*buckets:
+        return (np.broadcast_to(t, X.shape), X)
+
+    size = -(-T // buckets) # Divisão com arredondamento para cima
+    pad = buckets*size - T
+
+    # Completa o último intervalo repetindo a última amostra
+    t_pad = np.concatenate((t, np.full(pad, t[-1]))).reshape((buckets, size))
+    X_pad = np.concatenate((X, np.repeat(X[:, -1:], pad, axis=1)), axis=1).reshape((n, buckets, size))
+
+    i_min = np.argmin(X_pad, axis=2)
+    i_max = np.argmax(X_pad, axis=2)
+    index = np.stack((np.minimum(i_min, i_max), np.maximum(i_min, i_max)), axis=2)
+
+    t_dec = np.take_along_axis(np.broadcast_to(t_pad, (n, buckets, size)), index, axis=2)
+    X_dec = np.take_along_axis(X_pad, index, axis=2)
+
+    return (t_dec.reshape((n, 2*buckets)), X_dec.reshape((n, 2*buckets)))
+
+
+def peak_grid(X, rows, cols):
+    """
+    Reduz uma matriz de deslocamentos (massas x tempo) a no máximo rows x cols células,
+    mantendo em cada célula o valor de maior módulo (com sinal) dentre os que representa.
+
+    Args:
+        X (np.ndarray): deslocamentos, de formato (n, T).
+        rows (int): número máximo de linhas (massas).
+        cols (int): número máximo de colunas (instantes de tempo).
+
+    Returns:
+        np.ndarray: matriz reduzida.
+    """
+
+    n, T = X.shape
+    r = -(-n // rows) # Massas por célula
+    c = -(-T // cols) # Instantes por célula
+
+    # Preenche com zeros, que nunca superam o maior módulo de uma célula não vazia
+    grid = np.zeros((-(-n // r) * r, -(-T // c) * c))
+    grid[:n, :T] = X
+    grid = grid.reshape((grid.shape[0] // r, r, grid.shape[1] // c, c)).transpose((0, 2, 1, 3))
+    grid = grid.reshape(grid.shape[:2] + (r*c,))
+
+    index = np.argmax(np.abs(grid), axis=2)[..., None]
+
+    return np.take_along_axis(grid, index, axis=2)[..., 0]
+
+
+def plot(t_range, X, X0, path=None, mode='auto', masses=None, buckets=1000, max_subplots=12):
+    """
+    Gera o gráfico de deslocamento por tempo das massas. O Matplotlib só é importado aqui,
+    quando o gráfico é de fato solicitado. As séries são decimadas (mínimo/máximo) antes de
+    serem desenhadas e, para muitas massas, exibe-se um mapa de calor massa x tempo.
+
+    Args:
+        t_range (np.ndarray): instantes de tempo, de formato (1, T).
+        X (np.ndarray): deslocamentos, de formato (n, T).
+        X0 (np.ndarray): deslocamentos iniciais, utilizados no título.
+        path (str/None): arquivo onde salvar o gráfico; se None, o exibe numa janela.
+        mode (str): 'subplots' (uma massa por subplot), 'selected' (somente as massas em
+                    masses), 'heatmap' (mapa de calor) ou 'auto' (escolhe pelo número de massas).
+        masses (list/None): índices (a partir de 1) das massas exibidas no modo 'selected';
+                            se None, até max_subplots massas uniformemente espaçadas.
+        buckets (int): número de intervalos de tempo após a decimação (pixels, no mapa de calor).
+        max_subplots (int): maior número de subplots antes de o modo 'auto' usar o mapa de calor.
+    """
+
+    import matplotlib
+    if path is not None:
+        matplotlib.use('Agg') # Renderização fora da tela
+    import matplotlib.pyplot as plt
+
+    n = X.shape[0]
+    t = t_range[0, : ]
+
+    if mode == 'auto':
+        mode = 'subplots' if n <= max_subplots else ('selected' if masses is not None else 'heatmap')
+
+    if mode == 'subplots':
+        masses = list(range(1, n+1, 1))
+    elif mode == 'selected' and masses is None:
+        masses = sorted(set(np.linspace(1, n, min(n, max_subplots)).round().astype(int).tolist()))
+    elif mode not in ['selected', 'heatmap']:
+        raise ValueError(f"Erro: `mode` deve ser 'auto', 'subplots', 'selected' ou 'heatmap' e não {mode}.")
+
+    plt.style.use('seaborn' if 'seaborn' in plt.style.available else 'seaborn-v0_8') # Estilo: 'seaborn'
+    plt.rcParams["axes.edgecolor"] = "0.65" # Contorno cinza
+    plt.rcParams["axes.linewidth"] = 1.25   # com espessura 1.25
+
+    title = f'Simulações para X(0)ᵀ = {X0.T}' if n <= max_subplots else f'Simulação com {n} massas'
+
+    if mode == 'heatmap':
+        grid = peak_grid(X, 1000, buckets)
+        limit = np.max(np.abs(grid)) or 1.0
+
+        fig, ax = plt.subplots()
+        ax.grid(False)
+        image = ax.imshow(grid, aspect='auto', interpolation='nearest', cmap='RdBu_r', vmin=-limit, vmax=limit,
+                          extent=(t[0], t[-1], n + 0.5, 0.5))
+        fig.colorbar(image, ax=ax, label='Deslocamento (m)')
+
+        ax.set_title(title)
+        ax.set_xlabel('Tempo (s)')
+        ax.set_ylabel('Massa')
+
+    else:
+        t_dec, X_dec = decimate(t, X[np.array(masses) - 1, : ], buckets)
+
+        # Gera subplots
+        height = max(plt.rcParams['figure.figsize'][1], 0.6*len(masses))
+        fig, axs = plt.subplots(len(masses), 1, sharex=True, sharey=True, squeeze=False,
+                                figsize=(plt.rcParams['figure.figsize'][0], height))
+        axs = axs[:, 0]
+        fig.subplots_adjust(hspace=0)
+
+        # Gera plot invisível para agrupamento dos demais
+        overall = fig.add_subplot(111, frameon=False)
+        overall.grid(False)
+        overall.set_xticks([])
+        overall.set_yticks([])
+
+        overall.set_title(title)
+        overall.set_xlabel('Tempo (s)', labelpad=25)
+        overall.set_ylabel('Deslocamento (m)', labelpad=35)
+
+        # Insere dados nos plots
+        for i, mass in enumerate(masses):
+            axs[i].plot(t_dec[i], X_dec[i])
+            axs[i].yaxis.set_label_position("right")
+            if mode == 'subplots':
+                axs[i].set_ylabel(f'Massa {mass}', rotation=270, labelpad=15)  
+            else: # Rótulos horizontais não se sobrepõem com muitas massas
+                axs[i].set_ylabel(f'Massa {mass}', rotation=0, ha='left', va='center')
+
+    if path is None:
+        plt.show()
+    else:
+        fig.savefig(path, bbox_inches='tight')
+        plt.close(fig)
+
+    return
+
+
+# ================ #
+# Executa a tarefa #
+# ================ #
+
+def show(t_range, X, W, Q, X0, bound=0.0):
+    """
+    Exibe, interativamente, o gráfico, as frequências e os modos de vibração de uma simulação.
+    """
 
     # ==== #
     # Plot #
@@ -68,32 +731,7 @@ def run(task, epsilon, shifted, X0=None, n=None):
         print()
 
         if plot_graph.lower() == 's': # Exibe gráfico
-
-            plt.style.use('seaborn')                # Estilo: 'seaborn'
-            plt.rcParams["axes.edgecolor"] = "0.65" # Contorno cinza
-            plt.rcParams["axes.linewidth"] = 1.25   # com espessura 1.25
-
-            # Gera subplots
-            fig, axs = plt.subplots(n, 1, sharex=True, sharey=True)
-            fig.subplots_adjust(hspace=0)
-
-            # Gera plot invisível para agrupamento dos demais
-            overall = fig.add_subplot(111, frameon=False)
-            overall.grid(False)
-            overall.set_xticks([])
-            overall.set_yticks([])
-
-            overall.set_title(f'Simulações para X(0)ᵀ = {X0.T}')
-            overall.set_xlabel('Tempo (s)', labelpad=25)
-            overall.set_ylabel('Deslocamento (m)', labelpad=35)
-
-            # Insere dados nos plots
-            for i in range(1, n+1, 1):
-                axs[i-1].plot(t_range[0, : ], X[i-1, : ])
-                axs[i-1].yaxis.set_label_position("right")
-                axs[i-1].set_ylabel(f'Massa {i}', rotation=270, labelpad=15)  
-
-            plt.show()
+            plot(t_range, X, X0)
             break
 
         elif plot_graph.lower() == 'n': # Pula exibição do gráfico
@@ -111,5 +749,15 @@ def run(task, epsilon, shifted, X0=None, n=None):
 
     print(f"{ctext('> Modos de vibração:', 'b')}")
     print(Q, end='\n\n')
+
+    if bound > 0:
+        print(f"{ctext('> Limitante do erro de truncamento modal:', 'b')} {bound:.3e}", end='\n\n')
     
     return
+
+
+def run(task, epsilon, shifted, X0=None, n=None, t_end=10.0, dt=0.01, tol=None, top=None):
+    t_range, X, W, Q, X0, bound = simulate(task, epsilon, shifted, X0, n, t_end, dt, tol=tol, top=top)
+    show(t_range, X, W, Q, X0, bound)
+
+    return